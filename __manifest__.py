@@ -34,15 +34,22 @@ Fonctionnalités principales :
     'data': [
         'security/security.xml',
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/res_partner_views.xml',
         'views/monitor_certificate_views.xml',  # Loaded before monitor_training_views.xml
         'views/monitor_training_views.xml',
         'views/monitor_availability_views.xml',
         'views/monitor_evaluation_views.xml',
         'views/monitor_report_views.xml',
+        'views/monitor_statistics_views.xml',
         'views/monitor_planning_template_views.xml',
         'views/monitor_planning_views.xml',
+        'views/monitor_planning_analysis_views.xml',
+        'views/monitor_planning_archive_views.xml',
         'wizards/monitor_substitute_wizard_views.xml',
+        'wizards/monitor_report_generate_wizard_views.xml',
+        'wizards/monitor_absence_wizard_views.xml',
+        'wizards/monitor_availability_import_wizard_views.xml',
         'reports/monitor_planning.xml',
         'views/menu_views.xml',
         'views/monitor_template_views.xml',
@@ -1,12 +1,54 @@
-from odoo import http
+from odoo import api, http
 from odoo.http import request
+from odoo.tools import split_every
+from odoo.tools.pdf import merge_pdf
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import json
 import logging
+import math
 
 _logger = logging.getLogger(__name__)
 
+# Libellés et styles des badges d'état du rapport PDF
+PDF_STATE_BADGES = {
+    "planned": ("Planifiée", "background-color: #17a2b8; color: white;"),
+    "confirmed": ("Confirmée", "background-color: #ffc107; color: black;"),
+    "completed": ("Terminée", "background-color: #28a745; color: white;"),
+    "cancelled": ("Annulée", "background-color: #dc3545; color: white;"),
+}
+
+# Rendu PDF par lots : modes de découpage, seuil automatique et parallélisme
+PDF_CHUNK_MODES = ("month", "school")
+PDF_CHUNK_THRESHOLD = 500
+PDF_CHUNK_WORKERS = 2
+# Bornes de la route publique : nombre de lots rendus et période couverte
+PDF_MAX_CHUNKS = 24
+PDF_MAX_SPAN_DAYS = 731
+
+MONTH_NAMES = [
+    "Janvier", "Février", "Mars", "Avril", "Mai", "Juin",
+    "Juillet", "Août", "Septembre", "Octobre", "Novembre", "Décembre"
+]
+
+# Champs de monitor.planning lus en une seule requête pour le rapport PDF
+PDF_PLANNING_FIELDS = [
+    "planned_date",
+    "start_time",
+    "end_time",
+    "school_id",
+    "monitor_id",
+    "substitute_monitor_id",
+    "topic",
+    "target_age_group",
+    "description",
+    "expected_participants",
+    "actual_participants",
+    "state",
+    "is_overdue",
+]
+
 
 class MonitorPlanningWebController(http.Controller):
 
@@ -374,20 +416,30 @@ class MonitorPlanningWebController(http.Controller):
                         "%Y-%m-%d"
                     )
 
+            # Route publique : période bornée
+            span = datetime.strptime(date_to, "%Y-%m-%d") - datetime.strptime(date_from, "%Y-%m-%d")
+            if span.days > PDF_MAX_SPAN_DAYS:
+                values = {
+                    "error_message": f"La période demandée ne peut pas dépasser {PDF_MAX_SPAN_DAYS} jours.",
+                    "date_from": date_from,
+                    "date_to": date_to,
+                    "selected_school_name": selected_school_name,
+                    "selected_monitor_name": selected_monitor_name,
+                }
+                return request.render(
+                    "monitor_planning.monitor_planning_pdf_error_template", values
+                )
+
             # Ajouter les filtres de date
             domain.extend(
                 [("planned_date", ">=", date_from), ("planned_date", "<=", date_to)]
             )
 
-            # Rechercher les planifications
-            plannings = (
-                request.env["monitor.planning"]
-                .sudo()
-                .search(domain, order="planned_date asc, start_time asc")
-            )
+            planning_model = request.env["monitor.planning"].sudo()
+            planning_count = planning_model.search_count(domain)
 
             # Vérifier s'il y a des données
-            if not plannings:
+            if not planning_count:
                 # Retourner une page d'erreur au lieu d'un message texte
                 values = {
                     "error_message": "Aucune planification trouvée pour les critères spécifiés.",
@@ -400,9 +452,6 @@ class MonitorPlanningWebController(http.Controller):
                     "monitor_planning.monitor_planning_pdf_error_template", values
                 )
 
-            # Calculer les statistiques
-            statistics = self._calculate_monthly_statistics(plannings)
-            
             # Construire le titre du rapport
             report_title = "Planification des Moniteurs d'École du Dimanche"
 
@@ -412,22 +461,6 @@ class MonitorPlanningWebController(http.Controller):
             if selected_monitor_name:
                 report_title += f" - {selected_monitor_name}"
 
-            # Préparer les données pour le template
-            values = {
-                "plannings": plannings,
-                "report_title": report_title,
-                "date_from": date_from,
-                "date_to": date_to,
-                "generation_date": datetime.now().strftime("%d/%m/%Y %H:%M"),
-                "weekly_plannings": self._group_plannings_by_week(plannings),
-                "selected_school_name": selected_school_name,
-                "selected_monitor_name": selected_monitor_name,
-                # Ajouter les statistiques calculées
-                "stats": statistics,
-                # Ajouter les objets nécessaires pour le template
-                "datetime": datetime,
-            }
-
             # Vérifier l'existence du rapport
             report_ref = request.env.ref(
                 "monitor_planning.monitor_planning_pdf_report", raise_if_not_found=False
@@ -442,23 +475,69 @@ class MonitorPlanningWebController(http.Controller):
                     headers=[("Content-Type", "text/plain")],
                 )
 
-            # Générer le PDF avec gestion d'erreur améliorée
-            try:
-                pdf_content, pdf_type = report_ref.sudo()._render_qweb_pdf(
-                    'monitor_planning.monitor_planning_pdf_template', 
-                    plannings.ids, data=values
-                )
+            # Grandes périodes : rendu par lots (par mois ou par école)
+            chunk_by = kw.get("chunk_by")
+            if chunk_by not in PDF_CHUNK_MODES:
+                chunk_by = "month" if planning_count > PDF_CHUNK_THRESHOLD else None
 
+            if chunk_by:
+                base_values = {
+                    "report_title": report_title,
+                    "date_from": date_from,
+                    "date_to": date_to,
+                    "generation_date": datetime.now().strftime("%d/%m/%Y %H:%M"),
+                    "selected_school_name": selected_school_name,
+                    "selected_monitor_name": selected_monitor_name,
+                    "datetime": datetime,
+                }
+                pdf_content = self._render_chunked_pdf(domain, chunk_by, base_values)
                 if not pdf_content:
                     raise Exception("Le contenu PDF généré est vide")
-
-            except Exception as pdf_error:
-                _logger.error(f"Erreur lors du rendu PDF: {str(pdf_error)}")
-                # En cas d'erreur PDF, retourner la version HTML
-                return request.render(
-                    "monitor_planning.monitor_planning_pdf_template", values
+            else:
+                # Rechercher les planifications
+                plannings = planning_model.search(
+                    domain, order="planned_date asc, start_time asc"
                 )
 
+                # Aplatir les planifications en lignes pré-formatées (lecture groupée)
+                rows = self._prepare_pdf_rows(plannings)
+
+                # Calculer les statistiques
+                statistics = self._calculate_row_statistics(rows)
+
+                # Préparer les données pour le template
+                values = {
+                    "rows": rows,
+                    "report_title": report_title,
+                    "date_from": date_from,
+                    "date_to": date_to,
+                    "generation_date": datetime.now().strftime("%d/%m/%Y %H:%M"),
+                    "weeks": self._group_rows_by_week(rows),
+                    "selected_school_name": selected_school_name,
+                    "selected_monitor_name": selected_monitor_name,
+                    # Ajouter les statistiques calculées
+                    "stats": statistics,
+                    # Ajouter les objets nécessaires pour le template
+                    "datetime": datetime,
+                }
+
+                # Générer le PDF avec gestion d'erreur améliorée
+                try:
+                    pdf_content, pdf_type = report_ref.sudo()._render_qweb_pdf(
+                        'monitor_planning.monitor_planning_pdf_template', 
+                        plannings.ids, data=values
+                    )
+
+                    if not pdf_content:
+                        raise Exception("Le contenu PDF généré est vide")
+
+                except Exception as pdf_error:
+                    _logger.error(f"Erreur lors du rendu PDF: {str(pdf_error)}")
+                    # En cas d'erreur PDF, retourner la version HTML
+                    return request.render(
+                        "monitor_planning.monitor_planning_pdf_template", values
+                    )
+
             # Générer un nom de fichier sécurisé
             safe_date_from = date_from.replace("-", "")
             safe_date_to = date_to.replace("-", "")
@@ -519,7 +598,11 @@ class MonitorPlanningWebController(http.Controller):
                 domain = [d for d in domain if not (isinstance(d, tuple) and d[0] == "state")]
                 domain.append(("state", "=", kw["status"]))
             
-            plannings = request.env["monitor.planning"].sudo().search(domain)
+            plannings = (
+                request.env["monitor.planning"]
+                .sudo()
+                .search(domain, order="planned_date asc, start_time asc")
+            )
             
             # Formater les données
             daily_data = {}
@@ -632,6 +715,224 @@ class MonitorPlanningWebController(http.Controller):
                 'school_stats': {}
             }
 
+    def _get_pdf_chunks(self, domain, chunk_by):
+        """Découper le domaine du rapport en lots (domaine, libellé).
+
+        Seuls les mois ou écoles ayant des planifications donnent un lot ;
+        au-delà de PDF_MAX_CHUNKS, des groupes consécutifs sont regroupés.
+        """
+        planning_model = request.env["monitor.planning"].sudo()
+        if chunk_by == "school":
+            schools = [
+                school
+                for [school] in planning_model._read_group(domain, ["school_id"], order="school_id")
+            ]
+            return [
+                (
+                    domain + [("school_id", "in", [school.id for school in bundle])],
+                    bundle[0].name if len(bundle) == 1 else f"{bundle[0].name} … {bundle[-1].name}",
+                )
+                for bundle in self._bundle_pdf_groups(schools)
+            ]
+
+        months = [
+            month
+            for [month] in planning_model._read_group(domain, ["planned_date:month"], order="planned_date:month")
+        ]
+        chunks = []
+        for bundle in self._bundle_pdf_groups(months):
+            labels = [f"{MONTH_NAMES[month.month - 1]} {month.year}" for month in (bundle[0], bundle[-1])]
+            chunks.append(
+                (
+                    domain
+                    + [
+                        ("planned_date", ">=", bundle[0]),
+                        ("planned_date", "<", bundle[-1] + relativedelta(months=1)),
+                    ],
+                    labels[0] if len(bundle) == 1 else f"{labels[0]} - {labels[1]}",
+                )
+            )
+        return chunks
+
+    def _bundle_pdf_groups(self, groups):
+        """Répartir des groupes ordonnés en au plus PDF_MAX_CHUNKS lots consécutifs"""
+        size = max(1, math.ceil(len(groups) / PDF_MAX_CHUNKS))
+        return list(split_every(size, groups, list))
+
+    def _render_chunked_pdf(self, domain, chunk_by, values):
+        """Rendre le rapport par lots en parallèle puis fusionner les PDF.
+
+        Chaque lot est rendu dans un thread avec son propre curseur : la
+        mémoire de rendu (enregistrements, HTML) est bornée par la taille
+        d'un lot et les conversions wkhtmltopdf s'exécutent en parallèle.
+        """
+        chunks = self._get_pdf_chunks(domain, chunk_by)
+        workers = int(
+            request.env["ir.config_parameter"]
+            .sudo()
+            .get_param("sunday_school.pdf_chunk_workers", PDF_CHUNK_WORKERS)
+        )
+
+        env = request.env
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [
+                executor.submit(
+                    self._render_pdf_chunk,
+                    env.registry,
+                    env.uid,
+                    dict(env.context),
+                    chunk_domain,
+                    dict(values, report_title=f"{values['report_title']} - {label}"),
+                )
+                for chunk_domain, label in chunks
+            ]
+            # Conserver l'ordre des lots dans le document final
+            pdfs = [future.result() for future in futures]
+
+        pdfs = [pdf for pdf in pdfs if pdf]
+        if len(pdfs) <= 1:
+            return pdfs[0] if pdfs else None
+        return merge_pdf(pdfs)
+
+    def _render_pdf_chunk(self, registry, uid, context, domain, values):
+        """Rendre un lot du rapport PDF (exécuté dans un thread du pool)"""
+        with registry.cursor() as cr:
+            env = api.Environment(cr, uid, context)
+            plannings = (
+                env["monitor.planning"]
+                .sudo()
+                .search(domain, order="planned_date asc, start_time asc")
+            )
+            if not plannings:
+                return None
+
+            rows = self._prepare_pdf_rows(plannings)
+            chunk_values = dict(
+                values,
+                rows=rows,
+                weeks=self._group_rows_by_week(rows),
+                stats=self._calculate_row_statistics(rows),
+            )
+            report = env.ref("monitor_planning.monitor_planning_pdf_report").sudo()
+            pdf_content, pdf_type = report._render_qweb_pdf(
+                "monitor_planning.monitor_planning_pdf_template",
+                plannings.ids,
+                data=chunk_values,
+            )
+            return pdf_content
+
+    def _prepare_pdf_rows(self, plannings):
+        """Construire les lignes du rapport PDF en une seule passe.
+
+        Les champs des planifications et des partenaires liés sont lus par
+        lots (une requête par modèle) et toutes les valeurs affichées sont
+        pré-formatées, le template n'a plus qu'à les écrire.
+        """
+        records = plannings.read(PDF_PLANNING_FIELDS, load=None)
+
+        partner_ids = set()
+        for record in records:
+            for field_name in ("school_id", "monitor_id", "substitute_monitor_id"):
+                if record[field_name]:
+                    partner_ids.add(record[field_name])
+        partners = {
+            partner["id"]: partner
+            for partner in plannings.env["res.partner"]
+            .sudo()
+            .browse(list(partner_ids))
+            .read(["name", "street", "phone"])
+        }
+
+        rows = []
+        for record in records:
+            planned_date = record["planned_date"]
+            start_time = record["start_time"] or 0
+            end_time = record["end_time"] or 0
+            school = partners.get(record["school_id"], {})
+            monitor = partners.get(record["monitor_id"], {})
+            substitute = partners.get(record["substitute_monitor_id"], {})
+            state = record["state"]
+            state_label, state_style = PDF_STATE_BADGES.get(
+                state, (state or "N/D", "background-color: #6c757d; color: white;")
+            )
+            description = record["description"] or ""
+
+            time_range = False
+            duration = False
+            if start_time and end_time and start_time != end_time:
+                time_range = f"{self._format_time(start_time)} - {self._format_time(end_time)}"
+                duration = round(end_time - start_time, 1)
+
+            rows.append(
+                {
+                    "id": record["id"],
+                    "planned_date": planned_date,
+                    "date_short": planned_date.strftime("%d/%m") if planned_date else False,
+                    "date_long": planned_date.strftime("%d/%m/%Y") if planned_date else False,
+                    "weekday_short": planned_date.strftime("%a") if planned_date else False,
+                    "weekday_long": planned_date.strftime("%A") if planned_date else False,
+                    "time_range": time_range,
+                    "duration": duration,
+                    "school_name": school.get("name") or False,
+                    "school_street": school.get("street") or False,
+                    "monitor_name": monitor.get("name") or False,
+                    "monitor_phone": monitor.get("phone") or False,
+                    "substitute_name": substitute.get("name") or False,
+                    "topic": record["topic"] or "Non défini",
+                    "age_group": record["target_age_group"] or False,
+                    "description": (
+                        description[:40] + "..." if len(description) > 40 else description
+                    ),
+                    "expected_participants": record["expected_participants"],
+                    "actual_participants": (
+                        record["actual_participants"] if state == "completed" else 0
+                    ),
+                    "state": state,
+                    "state_label": state_label,
+                    "state_style": state_style,
+                    "is_overdue": record["is_overdue"],
+                }
+            )
+        return rows
+
+    def _calculate_row_statistics(self, rows):
+        """Calculer les statistiques du rapport à partir des lignes pré-formatées"""
+        stats = {
+            "total": len(rows),
+            "planned": 0,
+            "confirmed": 0,
+            "completed": 0,
+            "cancelled": 0,
+            "monitor_stats": {},
+            "school_stats": {},
+        }
+        for row in rows:
+            if row["state"] in stats:
+                stats[row["state"]] += 1
+            monitor_name = row["monitor_name"] or "Moniteur N/D"
+            stats["monitor_stats"][monitor_name] = stats["monitor_stats"].get(monitor_name, 0) + 1
+            school_name = row["school_name"] or "École N/D"
+            stats["school_stats"][school_name] = stats["school_stats"].get(school_name, 0) + 1
+        return stats
+
+    def _group_rows_by_week(self, rows):
+        """Grouper les lignes pré-formatées par semaine (du lundi au dimanche)"""
+        weeks = {}
+        for row in rows:
+            planned_date = row["planned_date"]
+            if not planned_date:
+                continue
+            week_start = planned_date - timedelta(days=planned_date.weekday())
+            week = weeks.get(week_start)
+            if week is None:
+                week = weeks[week_start] = {
+                    "week_start": week_start.strftime("%d/%m/%Y"),
+                    "week_end": (week_start + timedelta(days=6)).strftime("%d/%m/%Y"),
+                    "rows": [],
+                }
+            week["rows"].append(row)
+        return [weeks[key] for key in sorted(weeks)]
+
     def _group_plannings_by_week(self, plannings):
         """Grouper les planifications par semaine avec gestion d'erreur améliorée"""
         try:
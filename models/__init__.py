@@ -1,11 +1,16 @@
 # -*- encoding: utf-8 -*-
 
+from . import monitor_statistics_mixin
+from . import monitor_statistics
 from . import monitor_availability
+from . import monitor_availability_day
 from . import monitor_evaluation
 from . import monitor_training
 from . import monitor_certificate
 from . import monitor_report
 from . import monitor_planning_template
 from . import monitor_planning
+from . import monitor_planning_archive
+from . import monitor_planning_analysis
 from . import monitor_rotation_line
 from . import res_partner
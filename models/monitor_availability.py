@@ -7,6 +7,7 @@ import calendar
 class MonitorAvailability(models.Model):
     """Disponibilité des moniteurs"""
     _name = "monitor.availability"
+    _inherit = ['monitor.statistics.mixin']
     _description = "Disponibilité moniteur"
     _order = "date_from desc"
 
@@ -42,6 +43,24 @@ class MonitorAvailability(models.Model):
     available_time_from = fields.Float(string="Disponible de")
     available_time_to = fields.Float(string="Disponible jusqu'à")
     
+    # Champs dont dépend l'index journalier monitor.availability.day
+    _availability_index_fields = (
+        'monitor_id', 'date_from', 'date_to', 'availability_type',
+        'available_days', 'available_time_from', 'available_time_to',
+    )
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        availabilities = super().create(vals_list)
+        self.env['monitor.availability.day'].sudo()._sync_index(availabilities.ids)
+        return availabilities
+    
+    def write(self, vals):
+        result = super().write(vals)
+        if set(vals) & set(self._availability_index_fields):
+            self.env['monitor.availability.day'].sudo()._sync_index(self.ids)
+        return result
+    
     @api.constrains('date_from', 'date_to')
     def _check_dates(self):
         for availability in self:
@@ -0,0 +1,92 @@
+from odoo import models, fields, api, tools
+from collections import defaultdict
+
+# Valeurs de monitor.availability.available_days, dans l'ordre ISO (lundi = 1)
+ISO_WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+class MonitorAvailabilityDay(models.Model):
+    """Index journalier des restrictions de disponibilité des moniteurs
+
+    Une ligne par moniteur et par jour couvert par une indisponibilité ou une
+    disponibilité limitée : le moniteur n'est disponible ce jour-là que dans la
+    fenêtre [window_from, window_to] (fenêtre vide pour une indisponibilité).
+    L'index est maintenu à chaque modification de monitor.availability.
+    """
+    _name = "monitor.availability.day"
+    _description = "Index journalier des disponibilités"
+    _order = "date, monitor_id"
+    _rec_name = "monitor_id"
+    _log_access = False
+
+    availability_id = fields.Many2one('monitor.availability', required=True, ondelete='cascade', index=True)
+    monitor_id = fields.Many2one('res.partner', string="Moniteur", required=True, ondelete='cascade')
+    date = fields.Date(string="Date", required=True)
+    window_from = fields.Float(string="Disponible de")
+    window_to = fields.Float(string="Disponible jusqu'à")
+
+    def init(self):
+        tools.create_index(self.env.cr, 'monitor_availability_day_date_monitor_index', self._table, ['date', 'monitor_id'])
+        self._sync_index()
+
+    @api.model
+    def _sync_index(self, availability_ids=None):
+        """Reconstruit l'index des disponibilités données (toutes si None) en deux requêtes"""
+        self.env['monitor.availability'].flush_model()
+        if availability_ids is None:
+            where, params = '', []
+            self.env.cr.execute(f"DELETE FROM {self._table}")
+        else:
+            if not availability_ids:
+                return
+            where, params = 'AND availability.id = ANY(%s)', [list(availability_ids)]
+            self.env.cr.execute(f"DELETE FROM {self._table} WHERE availability_id = ANY(%s)", params)
+        # Jour couvert par une disponibilité limitée : fenêtre horaire déclarée
+        # (toute la journée si non renseignée) ; sinon aucune disponibilité
+        self.env.cr.execute(f"""
+            INSERT INTO {self._table} (availability_id, monitor_id, date, window_from, window_to)
+            SELECT availability.id, availability.monitor_id, day.day::date,
+                   CASE WHEN day.open THEN COALESCE(availability.available_time_from, 0) ELSE 0 END,
+                   CASE WHEN day.open THEN COALESCE(NULLIF(availability.available_time_to, 0), 24) ELSE 0 END
+              FROM monitor_availability availability
+             CROSS JOIN LATERAL (
+                   SELECT series.day,
+                          availability.availability_type = 'limited' AND (
+                              availability.available_days IS NULL
+                              OR array_position(%s::varchar[], availability.available_days::varchar) = EXTRACT(ISODOW FROM series.day)
+                          ) AS open
+                     FROM generate_series(availability.date_from, availability.date_to, interval '1 day') AS series(day)
+                   ) day
+             WHERE availability.availability_type IN ('unavailable', 'limited')
+               {where}
+        """, [ISO_WEEKDAYS, *params])
+        self.invalidate_model()
+
+    @api.model
+    def _get_unavailable_monitor_ids(self, slots):
+        """Moniteurs non disponibles sur chaque créneau, en une seule requête
+
+        ``slots`` est une liste de tuples (clé, date, heure de début, heure de fin) ;
+        retourne {clé: set(ids des moniteurs)}.
+        """
+        unavailable = defaultdict(set)
+        slots = list(slots)
+        if not slots:
+            return unavailable
+        keys = list(range(len(slots)))
+        self.env.cr.execute(f"""
+            SELECT DISTINCT slot.key, day.monitor_id
+              FROM unnest(%s::int[], %s::date[], %s::float[], %s::float[])
+                   AS slot(key, date, start_time, end_time)
+              JOIN {self._table} day
+                ON day.date = slot.date
+               AND NOT (day.window_from <= slot.start_time AND slot.end_time <= day.window_to)
+        """, [
+            keys,
+            [slot[1] for slot in slots],
+            [slot[2] or 0.0 for slot in slots],
+            [slot[3] or 0.0 for slot in slots],
+        ])
+        for index, monitor_id in self.env.cr.fetchall():
+            unavailable[slots[index][0]].add(monitor_id)
+        return unavailable
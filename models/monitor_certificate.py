@@ -2,11 +2,13 @@ from odoo import models, fields, api
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
 from odoo.exceptions import ValidationError, UserError
+from collections import defaultdict
 import calendar
 
 class MonitorCertificate(models.Model):
     """Certificats des moniteurs"""
     _name = "monitor.certificate"
+    _inherit = ['monitor.statistics.mixin']
     _description = "Certificat moniteur"
     _order = "certificate_date desc"
 
@@ -44,11 +46,13 @@ class MonitorCertificate(models.Model):
         default=lambda self: self.env.user.partner_id
     )
     
-    expiry_date = fields.Date(string="Date d'expiration")
+    expiry_date = fields.Date(string="Date d'expiration", index=True)
     is_expired = fields.Boolean(
         string="Expiré",
-        compute="_compute_is_expired"
+        compute="_compute_is_expired",
+        store=True
     )
+    expiry_alert_sent = fields.Boolean(string="Alerte d'expiration envoyée", default=False, copy=False)
     
     certificate_number = fields.Char(
         string="Numéro de certificat",
@@ -60,20 +64,172 @@ class MonitorCertificate(models.Model):
     def _compute_is_expired(self):
         today = fields.Date.today()
         for certificate in self:
-            certificate.is_expired = (
+            certificate.is_expired = bool(
                 certificate.expiry_date and 
                 certificate.expiry_date < today
             )
     
+    def write(self, vals):
+        # Une nouvelle date d'expiration donnera lieu à une nouvelle alerte
+        if 'expiry_date' in vals and 'expiry_alert_sent' not in vals:
+            vals = dict(vals, expiry_alert_sent=False)
+        return super().write(vals)
+    
+    @api.model
+    def _get_required_certificate_types(self):
+        """Types de certificat exigés pour intervenir (paramètre séparé par des virgules)"""
+        value = self.env['ir.config_parameter'].sudo().get_param('sunday_school.required_certificate_types', '')
+        return {certificate_type.strip() for certificate_type in value.split(',') if certificate_type.strip()}
+    
+    @api.model
+    def _get_compliant_monitor_ids(self, monitor_ids, dates):
+        """Moniteurs titulaires de tous les certificats exigés, valides à chaque date : {date: set}
+        
+        Retourne None lorsqu'aucun certificat n'est exigé. Les certificats de toute
+        la période sont lus en une requête ; le résultat est conservé par l'appelant
+        pendant tout le traitement (génération, suggestions de remplaçants).
+        """
+        required_types = self._get_required_certificate_types()
+        if not required_types:
+            return None
+        dates = set(dates)
+        compliant = {planned_date: set() for planned_date in dates}
+        if not dates or not monitor_ids:
+            return compliant
+        
+        periods_by_monitor = defaultdict(list)
+        for certificate in self.sudo().search_fetch([
+            ('monitor_id', 'in', list(monitor_ids)),
+            ('certificate_type', 'in', list(required_types)),
+            ('certificate_date', '<=', max(dates)),
+            '|', ('expiry_date', '=', False), ('expiry_date', '>=', min(dates)),
+        ], ['monitor_id', 'certificate_type', 'certificate_date', 'expiry_date']):
+            periods_by_monitor[certificate.monitor_id.id].append(
+                (certificate.certificate_type, certificate.certificate_date, certificate.expiry_date)
+            )
+        
+        for monitor_id, periods in periods_by_monitor.items():
+            for planned_date in dates:
+                valid_types = {
+                    certificate_type for certificate_type, date_from, date_to in periods
+                    if date_from <= planned_date and (not date_to or planned_date <= date_to)
+                }
+                if required_types <= valid_types:
+                    compliant[planned_date].add(monitor_id)
+        return compliant
+    
     @api.model
-    def create(self, vals):
-        """Générer automatiquement un numéro de certificat"""
-        if not vals.get('certificate_number'):
-            vals['certificate_number'] = self._generate_certificate_number()
-        return super().create(vals)
+    def _cron_refresh_expired(self):
+        """Met à jour le champ stocké is_expired par une seule requête ensembliste.
+
+        Le champ n'est recalculé que sur changement de date d'expiration : ce
+        passage quotidien bascule les certificats arrivés à expiration.
+        """
+        today = fields.Date.today()
+        self.flush_model(['expiry_date', 'is_expired'])
+        self.env.cr.execute("""
+            UPDATE monitor_certificate
+               SET is_expired = (expiry_date IS NOT NULL AND expiry_date < %s)
+             WHERE is_expired IS DISTINCT FROM (expiry_date IS NOT NULL AND expiry_date < %s)
+        """, [today, today])
+        self.invalidate_model(['is_expired'])
+    
+    @api.model
+    def _cron_send_expiry_alerts(self):
+        """Prévient chaque moniteur (une activité) de ses certificats qui vont expirer"""
+        days = int(self.env['ir.config_parameter'].sudo().get_param('sunday_school.certificate_expiry_alert_days', 30))
+        today = fields.Date.today()
+        groups = self._read_group([
+            ('expiry_date', '>=', today),
+            ('expiry_date', '<=', today + timedelta(days=days)),
+            ('expiry_alert_sent', '=', False),
+        ], ['monitor_id'], ['id:array_agg'])
+        if not groups:
+            return
+        
+        all_ids = [certificate_id for monitor, certificate_ids in groups for certificate_id in certificate_ids]
+        activity_type_id = self.env.ref('mail.mail_activity_data_todo').id
+        res_model_id = self.env['ir.model']._get('res.partner').id
+        self.env['mail.activity'].create([
+            self.browse(certificate_ids).with_prefetch(all_ids)._prepare_expiry_activity_values(
+                monitor, activity_type_id, res_model_id
+            )
+            for monitor, certificate_ids in groups
+        ])
+        self.browse(all_ids).write({'expiry_alert_sent': True})
+    
+    def _prepare_expiry_activity_values(self, monitor, activity_type_id, res_model_id):
+        """Valeurs de l'activité d'alerte d'expiration des certificats d'un moniteur"""
+        certificates = self.sorted('expiry_date')
+        lines = '\n'.join(
+            f"                - {certificate.name} ({certificate.certificate_number or 'sans numéro'}) : "
+            f"expire le {certificate.expiry_date.strftime('%d/%m/%Y')}"
+            for certificate in certificates
+        )
+        return {
+            'activity_type_id': activity_type_id,
+            'summary': 'Certificats arrivant à expiration',
+            'note': f'''
+                Bonjour {monitor.name},
+                
+                Les certificats suivants vont bientôt expirer :
+                
+{lines}
+                
+                Pensez à les renouveler.
+            ''',
+            'user_id': self.env.user.id,
+            'res_id': monitor.id,
+            'res_model_id': res_model_id,
+            'date_deadline': certificates[0].expiry_date,
+        }
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Générer automatiquement les numéros de certificat (un bloc réservé pour tout le lot)"""
+        missing = [vals for vals in vals_list if not vals.get('certificate_number')]
+        for vals, number in zip(missing, self._generate_certificate_numbers(len(missing))):
+            vals['certificate_number'] = number
+        return super().create(vals_list)
     
     def _generate_certificate_number(self):
         """Génère un numéro de certificat unique"""
+        return self._generate_certificate_numbers(1)[0]
+    
+    @api.model
+    def _generate_certificate_numbers(self, count):
+        """Génère ``count`` numéros de certificat en réservant la séquence en une fois"""
+        if not count:
+            return []
         year = fields.Date.today().year
-        sequence = self.env['ir.sequence'].next_by_code('monitor.certificate') or '001'
-        return f"CERT-{year}-{sequence}"
\ No newline at end of file
+        sequence = self.env['ir.sequence'].sudo().search([
+            ('code', '=', 'monitor.certificate'),
+            ('company_id', 'in', [self.env.company.id, False]),
+        ], order='company_id', limit=1)
+        if not sequence:
+            return [f"CERT-{year}-001"] * count
+        if sequence.use_date_range:
+            numbers = [sequence._next() for _index in range(count)]
+        else:
+            numbers = [sequence.get_next_char(number) for number in self._reserve_sequence_block(sequence, count)]
+        return [f"CERT-{year}-{number}" for number in numbers]
+    
+    @api.model
+    def _reserve_sequence_block(self, sequence, count):
+        """Réserve ``count`` valeurs consécutives de la séquence en une requête"""
+        if sequence.implementation == 'standard':
+            self.env.cr.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [f"ir_sequence_{sequence.id:03d}", count],
+            )
+            return [row[0] for row in self.env.cr.fetchall()]
+        # Séquence sans trou : une seule mise à jour (et un seul verrou) pour tout le bloc
+        self.env.cr.execute("""
+            UPDATE ir_sequence
+               SET number_next = number_next + %s * number_increment
+             WHERE id = %s
+         RETURNING number_next - %s * number_increment, number_increment
+        """, [count, sequence.id, count])
+        first, increment = self.env.cr.fetchone()
+        sequence.invalidate_recordset(['number_next'])
+        return [first + index * increment for index in range(count)]
\ No newline at end of file
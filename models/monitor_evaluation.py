@@ -7,8 +7,13 @@ import calendar
 class MonitorEvaluation(models.Model):
     """Évaluation des moniteurs"""
     _name = "monitor.evaluation"
+    _inherit = ['monitor.statistics.mixin']
     _description = "Évaluation moniteur"
     _order = "evaluation_date desc"
+    _monitor_statistics_fields = (
+        'monitor_id', 'evaluation_date', 'punctuality', 'preparation',
+        'teaching_quality', 'child_interaction', 'creativity',
+    )
 
     monitor_id = fields.Many2one(
         'res.partner',
@@ -1,16 +1,63 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
+from collections import defaultdict
 from odoo.exceptions import ValidationError, UserError
+from odoo.tools import split_every
 import calendar
+import copy
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Nombre de rappels traités (et validés en base) par lot
+REMINDER_BATCH_SIZE = 500
+
+# Index composites correspondant aux chemins d'accès (routes, génération, rappels)
+PLANNING_INDEXES = [
+    ('monitor_planning_planned_date_state_index', ['planned_date', 'state'], ''),
+    ('monitor_planning_monitor_planned_date_index', ['monitor_id', 'planned_date'], ''),
+    ('monitor_planning_school_planned_date_index', ['school_id', 'planned_date'], ''),
+    ('monitor_planning_template_planned_date_index', ['template_id', 'planned_date'], 'template_id IS NOT NULL'),
+    ('monitor_planning_substitute_planned_date_index', ['substitute_monitor_id', 'planned_date'], 'substitute_monitor_id IS NOT NULL'),
+]
+
+# Contexte des traitements de masse (générations, rappels, archivage, imports) :
+# ni suivi des modifications, ni abonnement automatique, ni message par planification ;
+# les affectations sur une indisponibilité sont journalisées au lieu d'être bloquées
+PLANNING_BULK_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+    'mail_auto_subscribe_no_notify': True,
+    'monitor_availability_warning': True,
+}
+
+# États dans lesquels l'intervenant doit être disponible
+AVAILABILITY_CHECKED_STATES = ['planned', 'confirmed', 'in_progress']
+
+# Nombre de remplaçants proposés par planification
+SUBSTITUTE_SUGGESTION_LIMIT = 10
+# Fenêtre (en jours, avant et après) sur laquelle est mesurée la charge récente
+SUBSTITUTE_LOAD_WINDOW_DAYS = 30
+
+# Statistiques du tableau de bord mises en cache (par processus), durée de vie en secondes
+PLANNING_STATISTICS_TTL = 60
+# Nombre maximal de résultats conservés (les plus anciens sont évincés)
+PLANNING_STATISTICS_CACHE_SIZE = 256
+_planning_statistics_cache = {}
 
 class MonitorPlanning(models.Model):
     """Planification d'intervention d'un moniteur"""
     _name = "monitor.planning"
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'monitor.statistics.mixin']
     _description = "Planification moniteur"
     _order = "planned_date desc, start_time"
     _rec_name = "display_name"
+    _monitor_statistics_fields = ('monitor_id', 'substitute_monitor_id', 'state', 'planned_date')
+    _monitor_statistics_partner_fields = ('monitor_id', 'substitute_monitor_id')
 
     name = fields.Char(string="Nom", required=True)
     
@@ -89,6 +136,10 @@ class MonitorPlanning(models.Model):
     reminder_sent = fields.Boolean(string="Rappel envoyé", default=False)
     confirmation_requested = fields.Boolean(string="Confirmation demandée", default=False)
     
+    def init(self):
+        for index_name, columns, where in PLANNING_INDEXES:
+            tools.create_index(self.env.cr, index_name, self._table, columns, where=where)
+    
     @api.depends('name', 'planned_date', 'monitor_id')
     def _compute_display_name(self):
         for planning in self:
@@ -123,6 +174,73 @@ class MonitorPlanning(models.Model):
                 planning.state in ['planned', 'confirmed']
             )
     
+    # Champs dont la modification impacte les statistiques des rapports d'activité
+    _report_stats_fields = (
+        'state', 'monitor_id', 'planned_date', 'actual_start_time',
+        'actual_end_time', 'actual_participants', 'rating',
+    )
+    
+    def _get_report_stats_keys(self):
+        """Couples (moniteur, date) utilisés par les rapports d'activité"""
+        return {(planning.monitor_id.id, planning.planned_date) for planning in self}
+    
+    def _trigger_report_stats(self, monitor_dates):
+        """Recalcule les statistiques des seuls rapports couvrant ces couples (moniteur, date)"""
+        self.env['monitor.report']._get_reports_covering(monitor_dates)._recompute_activity_stats()
+    
+    @api.model_create_multi
+    def create(self, vals_list):
+        plannings = super().create(vals_list)
+        plannings._trigger_report_stats(plannings._get_report_stats_keys())
+        self._invalidate_planning_statistics()
+        return plannings
+    
+    def write(self, vals):
+        if not set(vals) & set(self._report_stats_fields):
+            return super().write(vals)
+        monitor_dates = self._get_report_stats_keys()
+        result = super().write(vals)
+        self._trigger_report_stats(monitor_dates | self._get_report_stats_keys())
+        self._invalidate_planning_statistics()
+        return result
+    
+    def unlink(self):
+        monitor_dates = self._get_report_stats_keys()
+        result = super().unlink()
+        self._trigger_report_stats(monitor_dates)
+        self._invalidate_planning_statistics()
+        return result
+    
+    @api.model
+    def _cron_sweep_overdue(self):
+        """Marque en retard les planifications dont la date vient d'être dépassée.
+
+        Le champ stocké is_overdue n'est recalculé que sur changement de date
+        ou d'état : ce balayage quotidien le met à jour par une seule requête
+        ensembliste, limitée aux dates passées depuis le dernier balayage.
+        """
+        today = fields.Date.today()
+        params = self.env['ir.config_parameter'].sudo()
+        last_sweep = params.get_param('sunday_school.overdue_last_sweep')
+
+        self.flush_model(['planned_date', 'state', 'is_overdue'])
+        query = """
+            UPDATE monitor_planning
+               SET is_overdue = TRUE
+             WHERE planned_date < %s
+               AND state IN ('planned', 'confirmed')
+               AND is_overdue IS NOT TRUE
+        """
+        query_params = [today]
+        if last_sweep:
+            query += " AND planned_date >= %s"
+            query_params.append(last_sweep)
+        self.env.cr.execute(query, query_params)
+        self.invalidate_model(['is_overdue'])
+        self._invalidate_planning_statistics()
+
+        params.set_param('sunday_school.overdue_last_sweep', fields.Date.to_string(today))
+    
     @api.constrains('start_time', 'end_time')
     def _check_times(self):
         for planning in self:
@@ -136,46 +254,99 @@ class MonitorPlanning(models.Model):
                 planning.actual_start_time >= planning.actual_end_time):
                 raise ValidationError("L'heure de début réelle doit être antérieure à l'heure de fin réelle.")
     
+    @api.constrains('monitor_id', 'substitute_monitor_id', 'planned_date', 'start_time', 'end_time', 'state')
+    def _check_monitor_availability(self):
+        """L'intervenant (le remplaçant s'il y en a un) doit être disponible sur le créneau
+        
+        Vérifié en une requête pour tout le lot ; en mode avertissement
+        (contexte monitor_availability_warning) les conflits sont journalisés.
+        """
+        plannings = self.filtered(
+            lambda planning: planning.state in AVAILABILITY_CHECKED_STATES and planning.planned_date
+        )
+        unavailable = plannings._get_unavailable_monitor_ids()
+        conflicts = []
+        for planning in plannings:
+            assignee = planning.substitute_monitor_id or planning.monitor_id
+            if assignee.id in unavailable[planning.id]:
+                conflicts.append(
+                    f"{assignee.name} n'est pas disponible le "
+                    f"{planning.planned_date.strftime('%d/%m/%Y')} de "
+                    f"{self._format_time(planning.start_time)} à {self._format_time(planning.end_time)}"
+                )
+        if not conflicts:
+            return
+        if self.env.context.get('monitor_availability_warning'):
+            _logger.warning("Affectations sur une indisponibilité déclarée :\n%s", '\n'.join(conflicts))
+        else:
+            raise ValidationError("Disponibilités déclarées non respectées :\n" + '\n'.join(conflicts))
+    
     def action_confirm(self):
-        """Confirmer la planification"""
-        self.ensure_one()
-        if self.state == 'planned':
-            self.state = 'confirmed'
-            self.confirmation_requested = True
-            # Envoyer notification au moniteur
-            self._send_confirmation_notification()
+        """Confirmer les planifications"""
+        to_confirm = self.filtered(lambda planning: planning.state == 'planned')
+        if not to_confirm:
+            return
+        to_confirm.write({'state': 'confirmed', 'confirmation_requested': True})
+        # Envoyer les notifications aux moniteurs en un lot ; en mode récapitulatif,
+        # seules les interventions antérieures au prochain récapitulatif sont notifiées
+        if self._is_digest_mode():
+            next_digest = self._get_next_digest_date()
+            to_confirm = to_confirm.filtered(lambda planning: planning.planned_date < next_digest)
+        to_confirm._send_confirmation_notification()
     
     def action_start(self):
-        """Démarrer l'intervention"""
-        self.ensure_one()
-        if self.state in ['planned', 'confirmed']:
-            self.state = 'in_progress'
-            if not self.actual_start_time:
-                # Définir l'heure actuelle comme heure de début
-                now = datetime.now()
-                self.actual_start_time = now.hour + now.minute / 60.0
+        """Démarrer les interventions"""
+        to_start = self.filtered(lambda planning: planning.state in ['planned', 'confirmed'])
+        # Heure actuelle comme heure de début lorsqu'elle n'est pas renseignée
+        without_time = to_start.filtered(lambda planning: not planning.actual_start_time)
+        now = datetime.now()
+        (to_start - without_time)._write_transition({'state': 'in_progress'})
+        without_time._write_transition({
+            'state': 'in_progress',
+            'actual_start_time': now.hour + now.minute / 60.0,
+        })
     
     def action_complete(self):
-        """Terminer l'intervention"""
-        self.ensure_one()
-        if self.state == 'in_progress':
-            self.state = 'completed'
-            if not self.actual_end_time:
-                # Définir l'heure actuelle comme heure de fin
-                now = datetime.now()
-                self.actual_end_time = now.hour + now.minute / 60.0
+        """Terminer les interventions"""
+        to_complete = self.filtered(lambda planning: planning.state == 'in_progress')
+        # Heure actuelle comme heure de fin lorsqu'elle n'est pas renseignée
+        without_time = to_complete.filtered(lambda planning: not planning.actual_end_time)
+        now = datetime.now()
+        (to_complete - without_time)._write_transition({'state': 'completed'})
+        without_time._write_transition({
+            'state': 'completed',
+            'actual_end_time': now.hour + now.minute / 60.0,
+        })
     
     def action_cancel(self):
-        """Annuler la planification"""
-        self.ensure_one()
-        if self.state not in ['completed', 'cancelled']:
-            self.state = 'cancelled'
+        """Annuler les planifications"""
+        self.filtered(
+            lambda planning: planning.state not in ['completed', 'cancelled']
+        )._write_transition({'state': 'cancelled'})
     
     def action_postpone(self):
-        """Reporter la planification"""
-        self.ensure_one()
-        if self.state not in ['completed', 'cancelled']:
-            self.state = 'postponed'
+        """Reporter les planifications"""
+        self.filtered(
+            lambda planning: planning.state not in ['completed', 'cancelled']
+        )._write_transition({'state': 'postponed'})
+    
+    def _with_bulk_mode(self):
+        """Planifications en mode « traitement de masse »
+        
+        Les créations et écritures ne génèrent ni suivi, ni abonnés, ni message
+        par enregistrement ; le traitement appelant publie un seul récapitulatif.
+        """
+        return self.with_context(**PLANNING_BULK_CONTEXT)
+    
+    @api.model
+    def load(self, fields, data):
+        # Les imports passent par le mode traitement de masse
+        return super(MonitorPlanning, self._with_bulk_mode()).load(fields, data)
+    
+    def _write_transition(self, vals):
+        """Applique un changement d'état en une seule écriture pour tout le lot"""
+        if self:
+            self.write(vals)
     
     def action_request_substitute(self):
         """Demander un remplaçant"""
@@ -193,11 +364,108 @@ class MonitorPlanning(models.Model):
             }
         }
     
+    def _get_unavailable_monitor_ids(self):
+        """Moniteurs indisponibles sur le créneau de chaque planification : {planning_id: set}"""
+        return self.env['monitor.availability.day'].sudo()._get_unavailable_monitor_ids(
+            (planning.id, planning.planned_date, planning.start_time, planning.end_time)
+            for planning in self
+        )
+    
+    def _get_busy_monitor_ids(self):
+        """Moniteurs déjà occupés sur un créneau qui chevauche chaque planification : {planning_id: set}"""
+        busy = defaultdict(set)
+        dates = set(self.mapped('planned_date'))
+        if not dates:
+            return busy
+        others_by_date = defaultdict(list)
+        for other in self.sudo().search_fetch([
+            ('planned_date', 'in', list(dates)),
+            ('state', 'not in', ['cancelled', 'postponed']),
+            ('id', 'not in', self.ids),
+        ], ['planned_date', 'start_time', 'end_time', 'monitor_id', 'substitute_monitor_id']):
+            others_by_date[other.planned_date].append(other)
+        for planning in self:
+            for other in others_by_date[planning.planned_date]:
+                if other.start_time < planning.end_time and planning.start_time < other.end_time:
+                    busy[planning.id].add(other.monitor_id.id)
+                    if other.substitute_monitor_id:
+                        busy[planning.id].add(other.substitute_monitor_id.id)
+        return busy
+    
+    def _get_monitor_recent_loads(self, monitor_ids):
+        """Nombre d'interventions (titulaire ou remplaçant) autour des dates des planifications"""
+        dates = self.mapped('planned_date')
+        window = timedelta(days=SUBSTITUTE_LOAD_WINDOW_DAYS)
+        domain = [
+            ('planned_date', '>=', min(dates) - window),
+            ('planned_date', '<=', max(dates) + window),
+            ('state', 'not in', ['cancelled', 'postponed']),
+        ]
+        loads = defaultdict(int)
+        for field_name in ('monitor_id', 'substitute_monitor_id'):
+            for monitor, count in self.sudo()._read_group(
+                domain + [(field_name, 'in', monitor_ids)], [field_name], ['__count']
+            ):
+                loads[monitor.id] += count
+        return loads
+    
+    def _get_substitute_suggestions(self, limit=SUBSTITUTE_SUGGESTION_LIMIT):
+        """Remplaçants possibles de chaque planification, du plus au moins pertinent
+        
+        Retourne {planning_id: [{'monitor_id', 'recent_load', 'average_rating'}, ...]}.
+        Les moniteurs indisponibles, déjà occupés sur le créneau ou sans les
+        certificats exigés valides à la date sont exclus ; les autres sont classés
+        par charge récente croissante puis par note moyenne décroissante. Le
+        nombre de requêtes ne dépend pas du nombre de moniteurs.
+        """
+        plannings = self.filtered('planned_date')
+        if not plannings:
+            return {}
+        monitor_ids = self.env['res.partner'].sudo().search([('is_monitor', '=', True)]).ids
+        unavailable = plannings._get_unavailable_monitor_ids()
+        busy = plannings._get_busy_monitor_ids()
+        compliant = self.env['monitor.certificate']._get_compliant_monitor_ids(
+            monitor_ids, plannings.mapped('planned_date')
+        )
+        loads = plannings._get_monitor_recent_loads(monitor_ids)
+        ratings = {
+            monitor.id: rating
+            for monitor, rating in self.env['monitor.evaluation'].sudo()._read_group(
+                [('monitor_id', 'in', monitor_ids)], ['monitor_id'], ['overall_rating:avg']
+            )
+        }
+        ranked_ids = sorted(monitor_ids, key=lambda monitor_id: (loads[monitor_id], -(ratings.get(monitor_id) or 0)))
+        
+        suggestions = {}
+        for planning in plannings:
+            excluded = unavailable[planning.id] | busy[planning.id] | {planning.monitor_id.id}
+            candidates = [
+                monitor_id for monitor_id in ranked_ids
+                if monitor_id not in excluded and (compliant is None or monitor_id in compliant[planning.planned_date])
+            ]
+            suggestions[planning.id] = [{
+                'monitor_id': monitor_id,
+                'recent_load': loads[monitor_id],
+                'average_rating': ratings.get(monitor_id) or 0.0,
+            } for monitor_id in candidates[:limit]]
+        return suggestions
+    
     def _send_confirmation_notification(self):
-        """Envoie une notification de confirmation au moniteur"""
-        # Créer une activité de rappel
-        self.env['mail.activity'].create({
-            'activity_type_id': self.env.ref('mail.mail_activity_data_todo').id,
+        """Envoie une notification de confirmation aux moniteurs (une activité par planification)"""
+        if not self:
+            return self.env['mail.activity']
+        activity_type_id = self.env.ref('mail.mail_activity_data_todo').id
+        res_model_id = self.env['ir.model']._get('res.partner').id
+        return self.env['mail.activity'].create([
+            planning._prepare_confirmation_activity_values(activity_type_id, res_model_id)
+            for planning in self
+        ])
+    
+    def _prepare_confirmation_activity_values(self, activity_type_id, res_model_id):
+        """Valeurs de l'activité de confirmation d'une planification"""
+        self.ensure_one()
+        return {
+            'activity_type_id': activity_type_id,
             'summary': f'Confirmation intervention - {self.display_name}',
             'note': f'''
                 Bonjour {self.monitor_id.name},
@@ -213,9 +481,82 @@ class MonitorPlanning(models.Model):
             ''',
             'user_id': self.env.user.id,
             'res_id': self.monitor_id.id,
-            'res_model_id': self.env['ir.model']._get('res.partner').id,
+            'res_model_id': res_model_id,
             'date_deadline': self.planned_date - timedelta(days=3),
-        })
+        }
+    
+    @api.model
+    def _is_digest_mode(self):
+        """Mode récapitulatif : une seule notification par moniteur et par période"""
+        return self.env['ir.config_parameter'].sudo().get_param('sunday_school.notification_mode') == 'digest'
+    
+    @api.model
+    def _get_next_digest_date(self):
+        """Date de la prochaine exécution du récapitulatif (jamais si la tâche est inactive)"""
+        cron = self.env.ref('monitor_planning.ir_cron_send_weekly_digest', raise_if_not_found=False)
+        if not cron or not cron.sudo().active:
+            return date.max
+        return max(fields.Date.to_date(cron.sudo().nextcall), fields.Date.today())
+    
+    def _prepare_digest_activity_values(self, monitor, period_from, period_to, activity_type_id, res_model_id):
+        """Valeurs de l'activité récapitulative des planifications d'un moniteur"""
+        lines = '\n'.join(
+            f"                - {planning.planned_date.strftime('%d/%m/%Y')} "
+            f"{self._format_time(planning.start_time)} - {self._format_time(planning.end_time)} : "
+            f"{planning.school_id.name} ({planning.topic or 'Sujet à définir'})"
+            for planning in self
+        )
+        return {
+            'activity_type_id': activity_type_id,
+            'summary': f'Vos interventions du {period_from.strftime("%d/%m/%Y")} au {period_to.strftime("%d/%m/%Y")}',
+            'note': f'''
+                Bonjour {monitor.name},
+                
+                Voici vos interventions prévues à l'école du dimanche :
+                
+{lines}
+                
+                Merci de confirmer votre disponibilité.
+            ''',
+            'user_id': self.env.user.id,
+            'res_id': monitor.id,
+            'res_model_id': res_model_id,
+            'date_deadline': min(self.mapped('planned_date')) - timedelta(days=1),
+        }
+    
+    @api.model
+    def _cron_send_weekly_digest(self):
+        """Envoie un récapitulatif par moniteur des interventions de la période à venir"""
+        if not self._is_digest_mode():
+            return
+        params = self.env['ir.config_parameter'].sudo()
+        period_from = fields.Date.today()
+        period_to = period_from + timedelta(days=int(params.get_param('sunday_school.digest_days', 7)))
+
+        # Une seule requête groupée par moniteur
+        groups = self._read_group([
+            ('planned_date', '>=', period_from),
+            ('planned_date', '<=', period_to),
+            ('state', 'in', ['planned', 'confirmed']),
+            ('reminder_sent', '=', False),
+        ], ['monitor_id'], ['id:array_agg'])
+        if not groups:
+            return
+
+        all_ids = [planning_id for monitor, planning_ids in groups for planning_id in planning_ids]
+        activity_type_id = self.env.ref('mail.mail_activity_data_todo').id
+        res_model_id = self.env['ir.model']._get('res.partner').id
+        vals_list = []
+        for monitor, planning_ids in groups:
+            plannings = self.browse(planning_ids).with_prefetch(all_ids).sorted(
+                lambda planning: (planning.planned_date, planning.start_time)
+            )
+            vals_list.append(plannings._prepare_digest_activity_values(
+                monitor, period_from, period_to, activity_type_id, res_model_id
+            ))
+        self.env['mail.activity'].create(vals_list)
+        self.browse(all_ids)._with_bulk_mode().write({'reminder_sent': True})
+        _logger.info("Récapitulatif envoyé à %s moniteurs (%s planifications)", len(groups), len(all_ids))
     
     def _format_time(self, time_float):
         """Formate une heure décimale en HH:MM"""
@@ -225,38 +566,130 @@ class MonitorPlanning(models.Model):
     
     @api.model
     def _cron_send_reminders(self):
-        """Envoie des rappels automatiques (à configurer dans les tâches planifiées)"""
-        # Rappels 3 jours avant
-        reminder_date = fields.Date.today() + timedelta(days=3)
-        plannings_to_remind = self.search([
-            ('planned_date', '=', reminder_date),
+        """Envoie les rappels automatiques par lots validés en base"""
+        days_before = int(
+            self.env['ir.config_parameter'].sudo().get_param('sunday_school.reminder_days_before', 3)
+        )
+        today = fields.Date.today()
+        # Intervalle plutôt que date exacte : une exécution manquée est rattrapée
+        domain = [
+            ('planned_date', '>=', today),
+            ('planned_date', '<=', today + timedelta(days=days_before)),
             ('state', 'in', ['planned', 'confirmed']),
             ('reminder_sent', '=', False)
-        ])
+        ]
+        if self._is_digest_mode():
+            # Les interventions couvertes par le prochain récapitulatif l'attendent ;
+            # celles qui auront lieu avant sont rappelées ici (créées ou confirmées
+            # après le dernier récapitulatif)
+            domain = [
+                ('planned_date', '>=', today),
+                ('planned_date', '<', self._get_next_digest_date()),
+                ('state', 'in', ['planned', 'confirmed']),
+                ('reminder_sent', '=', False)
+            ]
+        plannings_to_remind = self.search(domain)
         
-        for planning in plannings_to_remind:
-            planning._send_confirmation_notification()
-            planning.reminder_sent = True
+        for batch_ids in split_every(REMINDER_BATCH_SIZE, plannings_to_remind.ids):
+            batch = self.browse(batch_ids)._with_bulk_mode()
+            batch._send_confirmation_notification()
+            batch.write({'reminder_sent': True})
+            self.env.cr.commit()
+        _logger.info("Rappels envoyés pour %s planifications", len(plannings_to_remind))
     
     @api.model
-    def get_planning_statistics(self):
-        """Retourne des statistiques sur les planifications"""
-        stats = {}
+    def get_planning_statistics(self, date_from=None, date_to=None):
+        """Retourne des statistiques sur les planifications (éventuellement sur une période)
         
-        # Statistiques générales
-        stats['total'] = self.search_count([])
-        stats['planned'] = self.search_count([('state', '=', 'planned')])
-        stats['confirmed'] = self.search_count([('state', '=', 'confirmed')])
-        stats['completed'] = self.search_count([('state', '=', 'completed')])
-        stats['cancelled'] = self.search_count([('state', '=', 'cancelled')])
-        stats['overdue'] = self.search_count([('is_overdue', '=', True)])
+        Le résultat est mis en cache par société et par périmètre de visibilité
+        pendant PLANNING_STATISTICS_TTL secondes. Les modifications le vident après
+        validation dans ce processus ; les autres workers attendent l'expiration.
+        Une copie est retournée : l'appelant peut la modifier sans altérer le cache.
+        """
+        # Les moniteurs ne voient que leurs planifications : cache propre à l'utilisateur
+        scope = 'all' if self.env.user.has_group('monitor_planning.group_monitor_coordinator') else self.env.uid
+        date_from, date_to = fields.Date.to_date(date_from), fields.Date.to_date(date_to)
+        key = (self.env.cr.dbname, self.env.company.id, scope, date_from, date_to)
+        cached = _planning_statistics_cache.get(key)
+        if cached and time.monotonic() - cached[0] < PLANNING_STATISTICS_TTL:
+            return copy.deepcopy(cached[1])
+        stats = self._compute_planning_statistics(date_from, date_to)
+        self._store_planning_statistics(key, stats)
+        return copy.deepcopy(stats)
+
+    @api.model
+    def _store_planning_statistics(self, key, stats):
+        """Met en cache un résultat après avoir évincé les entrées expirées,
+        puis les plus anciennes au-delà de PLANNING_STATISTICS_CACHE_SIZE"""
+        now = time.monotonic()
+        # Copie des entrées : le cache est partagé entre les threads du serveur
+        entries = list(_planning_statistics_cache.items())
+        for cached_key, (stored_at, _stats) in entries:
+            if now - stored_at >= PLANNING_STATISTICS_TTL:
+                _planning_statistics_cache.pop(cached_key, None)
+        # Les clés sont rangées par ordre d'insertion : les premières sont les plus anciennes
+        overflow = len(_planning_statistics_cache) - PLANNING_STATISTICS_CACHE_SIZE + 1
+        for cached_key in list(_planning_statistics_cache)[:max(overflow, 0)]:
+            _planning_statistics_cache.pop(cached_key, None)
+        _planning_statistics_cache.pop(key, None)
+        _planning_statistics_cache[key] = (now, stats)
+    
+    @api.model
+    def _compute_planning_statistics(self, date_from=None, date_to=None):
+        """Calcule toutes les statistiques (planifications actives et archivées)
+        en une requête groupée par table"""
+        domain = []
+        if date_from:
+            domain.append(('planned_date', '>=', date_from))
+        if date_to:
+            domain.append(('planned_date', '<=', date_to))
         
-        # Statistiques par moniteur
-        monitor_stats = self.read_group(
-            domain=[('state', '=', 'completed')],
-            fields=['monitor_id'],
-            groupby=['monitor_id']
-        )
-        stats['by_monitor'] = monitor_stats
+        stats = dict.fromkeys(['total', 'planned', 'confirmed', 'completed', 'cancelled', 'overdue'], 0)
+        completed_by_monitor = defaultdict(int)
+        for state, is_overdue, monitor, count in self._read_group(
+            domain, ['state', 'is_overdue', 'monitor_id'], ['__count']
+        ):
+            stats['total'] += count
+            if state in stats:
+                stats[state] += count
+            if is_overdue:
+                stats['overdue'] += count
+            if state == 'completed':
+                completed_by_monitor[monitor] += count
         
-        return stats
\ No newline at end of file
+        # Les planifications archivées (terminées ou annulées) restent comptabilisées
+        for state, monitor, count in self.env['monitor.planning.archive']._read_group(
+            domain, ['state', 'monitor_id'], ['__count']
+        ):
+            stats['total'] += count
+            stats[state] += count
+            if state == 'completed':
+                completed_by_monitor[monitor] += count
+        
+        # Statistiques par moniteur (même format que read_group)
+        stats['by_monitor'] = [
+            {'monitor_id': (monitor.id, monitor.display_name), 'monitor_id_count': count}
+            for monitor, count in completed_by_monitor.items()
+        ]
+        return stats
+    
+    @api.model
+    def _invalidate_planning_statistics(self):
+        """Vide le cache des statistiques du tableau de bord pour cette base,
+        une fois la transaction validée
+
+        Vidé avant la validation, le cache pourrait être regarni par une requête
+        concurrente lisant encore l'ancien état. Seul le cache de ce processus
+        est vidé : les autres workers attendent l'expiration des entrées
+        (PLANNING_STATISTICS_TTL).
+        """
+        postcommit = self.env.cr.postcommit
+        if postcommit.data.get('monitor_planning_statistics_invalidated'):
+            return
+        postcommit.data['monitor_planning_statistics_invalidated'] = True
+        dbname = self.env.cr.dbname
+
+        @postcommit.add
+        def invalidate():
+            for key in [key for key in _planning_statistics_cache if key[0] == dbname]:
+                _planning_statistics_cache.pop(key, None)
\ No newline at end of file
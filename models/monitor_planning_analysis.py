@@ -0,0 +1,85 @@
+from odoo import models, fields, tools
+
+
+class MonitorPlanningAnalysis(models.Model):
+    """Analyse de la charge des moniteurs (vue SQL pour pivot et graphique)"""
+    _name = "monitor.planning.analysis"
+    _description = "Analyse de la charge des moniteurs"
+    _auto = False
+    _order = "planned_date desc"
+    _rec_name = "planning_id"
+
+    planning_id = fields.Many2one('monitor.planning', string="Planification", readonly=True)
+    monitor_id = fields.Many2one('res.partner', string="Moniteur", readonly=True)
+    substitute_monitor_id = fields.Many2one('res.partner', string="Moniteur remplaçant", readonly=True)
+    school_id = fields.Many2one('res.partner', string="École", readonly=True)
+    template_id = fields.Many2one('monitor.planning.template', string="Modèle de planification", readonly=True)
+    recurrence_type = fields.Selection([
+        ('weekly', 'Hebdomadaire'),
+        ('biweekly', 'Bi-hebdomadaire'),
+        ('monthly', 'Mensuel'),
+        ('quarterly', 'Trimestriel'),
+        ('custom', 'Personnalisé')
+    ], string="Type de récurrence", readonly=True)
+
+    planned_date = fields.Date(string="Date prévue", readonly=True)
+    planned_month = fields.Date(string="Mois", readonly=True)
+    planned_week = fields.Date(string="Semaine", readonly=True)
+    state = fields.Selection([
+        ('planned', 'Planifié'),
+        ('confirmed', 'Confirmé'),
+        ('in_progress', 'En cours'),
+        ('completed', 'Terminé'),
+        ('cancelled', 'Annulé'),
+        ('postponed', 'Reporté')
+    ], string="État", readonly=True)
+
+    # Mesures
+    planning_count = fields.Integer(string="Nombre d'interventions", readonly=True)
+    hours_planned = fields.Float(string="Heures prévues", readonly=True)
+    hours_actual = fields.Float(string="Heures réalisées", readonly=True)
+    expected_participants = fields.Integer(string="Participants attendus", readonly=True)
+    actual_participants = fields.Integer(string="Participants réels", readonly=True)
+    rating = fields.Float(string="Note moyenne", readonly=True, group_operator='avg')
+    substitution_count = fields.Integer(string="Remplacements", readonly=True)
+    is_archived = fields.Boolean(string="Archivée", readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT
+                    planning.id AS id,
+                    planning.planning_id AS planning_id,
+                    planning.monitor_id AS monitor_id,
+                    planning.substitute_monitor_id AS substitute_monitor_id,
+                    planning.school_id AS school_id,
+                    planning.template_id AS template_id,
+                    template.recurrence_type AS recurrence_type,
+                    planning.planned_date AS planned_date,
+                    date_trunc('month', planning.planned_date)::date AS planned_month,
+                    date_trunc('week', planning.planned_date)::date AS planned_week,
+                    planning.state AS state,
+                    1 AS planning_count,
+                    COALESCE(planning.duration_planned, 0) AS hours_planned,
+                    COALESCE(planning.duration_actual, 0) AS hours_actual,
+                    COALESCE(planning.expected_participants, 0) AS expected_participants,
+                    COALESCE(planning.actual_participants, 0) AS actual_participants,
+                    NULLIF(planning.rating, '')::integer AS rating,
+                    CASE WHEN planning.substitute_monitor_id IS NOT NULL THEN 1 ELSE 0 END AS substitution_count,
+                    planning.is_archived AS is_archived
+                FROM (
+                    SELECT id, id AS planning_id, monitor_id, substitute_monitor_id, school_id,
+                           template_id, planned_date, state, duration_planned, duration_actual,
+                           expected_participants, actual_participants, rating, FALSE AS is_archived
+                      FROM monitor_planning
+                 UNION ALL
+                    -- Identifiants négatifs pour ne pas entrer en collision avec les planifications actives
+                    SELECT -id, NULL, monitor_id, substitute_monitor_id, school_id,
+                           template_id, planned_date, state, duration_planned, duration_actual,
+                           expected_participants, actual_participants, rating, TRUE
+                      FROM monitor_planning_archive
+                ) planning
+                LEFT JOIN monitor_planning_template template ON template.id = planning.template_id
+            )
+        """ % self._table)
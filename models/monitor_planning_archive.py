@@ -0,0 +1,141 @@
+from odoo import models, fields, api
+from odoo.tools import split_every
+from datetime import timedelta
+import logging
+
+from .monitor_planning import PLANNING_BULK_CONTEXT
+
+_logger = logging.getLogger(__name__)
+
+# Planifications déplacées (et validées en base) par lot
+ARCHIVE_BATCH_SIZE = 1000
+
+# États définitifs pouvant être archivés
+ARCHIVABLE_STATES = ['completed', 'cancelled']
+
+# Champs recopiés tels quels depuis monitor.planning
+ARCHIVED_PLANNING_FIELDS = [
+    'name', 'template_id', 'school_id', 'monitor_id', 'substitute_monitor_id',
+    'planned_date', 'start_time', 'end_time', 'topic', 'description',
+    'target_age_group', 'expected_participants', 'state',
+    'actual_start_time', 'actual_end_time', 'actual_participants',
+    'monitor_feedback', 'supervisor_feedback', 'rating',
+    'duration_planned', 'duration_actual',
+]
+
+
+class MonitorPlanningArchive(models.Model):
+    """Planification historique déplacée hors de la table des planifications actives"""
+    _name = "monitor.planning.archive"
+    _inherit = ['mail.thread']
+    _description = "Planification archivée"
+    _order = "planned_date desc, start_time"
+
+    name = fields.Char(string="Nom", required=True, readonly=True)
+    original_id = fields.Integer(string="ID d'origine", readonly=True, index=True)
+    archived_on = fields.Datetime(string="Archivée le", readonly=True)
+
+    template_id = fields.Many2one('monitor.planning.template', string="Modèle de planification", ondelete='set null', readonly=True)
+    school_id = fields.Many2one('res.partner', string="École", readonly=True)
+    monitor_id = fields.Many2one('res.partner', string="Moniteur assigné", readonly=True, index=True)
+    substitute_monitor_id = fields.Many2one('res.partner', string="Moniteur remplaçant", readonly=True, index='btree_not_null')
+
+    planned_date = fields.Date(string="Date prévue", readonly=True, index=True)
+    start_time = fields.Float(string="Heure de début", readonly=True)
+    end_time = fields.Float(string="Heure de fin", readonly=True)
+
+    topic = fields.Char(string="Sujet/Thème", readonly=True)
+    description = fields.Text(string="Description de l'intervention", readonly=True)
+    target_age_group = fields.Char(string="Groupe d'âge ciblé", readonly=True)
+    expected_participants = fields.Integer(string="Participants attendus", readonly=True)
+
+    state = fields.Selection([
+        ('completed', 'Terminé'),
+        ('cancelled', 'Annulé'),
+    ], string="État", readonly=True)
+
+    actual_start_time = fields.Float(string="Heure de début réelle", readonly=True)
+    actual_end_time = fields.Float(string="Heure de fin réelle", readonly=True)
+    actual_participants = fields.Integer(string="Participants réels", readonly=True)
+
+    monitor_feedback = fields.Text(string="Retour du moniteur", readonly=True)
+    supervisor_feedback = fields.Text(string="Retour du superviseur", readonly=True)
+    rating = fields.Selection([
+        ('1', 'Très insatisfaisant'),
+        ('2', 'Insatisfaisant'),
+        ('3', 'Correct'),
+        ('4', 'Bien'),
+        ('5', 'Excellent')
+    ], string="Évaluation", readonly=True)
+
+    duration_planned = fields.Float(string="Durée prévue (h)", readonly=True)
+    duration_actual = fields.Float(string="Durée réelle (h)", readonly=True)
+
+    @api.model
+    def _get_archive_cutoff(self):
+        """Date avant laquelle les planifications terminées ou annulées sont archivées"""
+        days = int(self.env['ir.config_parameter'].sudo().get_param('sunday_school.archive_after_days', 365))
+        return fields.Date.today() - timedelta(days=days)
+
+    @api.model
+    def _archive_plannings(self, cutoff=None, batch_size=ARCHIVE_BATCH_SIZE, commit=False):
+        """Déplace par lots les planifications antérieures à la date limite.
+
+        Retourne le nombre de planifications archivées.
+        """
+        cutoff = cutoff or self._get_archive_cutoff()
+        Planning = self.env['monitor.planning'].sudo()
+        planning_ids = Planning.search([
+            ('planned_date', '<', cutoff),
+            ('state', 'in', ARCHIVABLE_STATES),
+        ], order='id').ids
+
+        for batch_ids in split_every(batch_size, planning_ids):
+            self.sudo()._archive_batch(Planning.browse(batch_ids))
+            if commit:
+                self.env.cr.commit()
+        _logger.info("%s planifications archivées (antérieures au %s)", len(planning_ids), cutoff)
+        return len(planning_ids)
+
+    @api.model
+    def _archive_batch(self, plannings):
+        """Recopie les planifications, déplace leur historique puis les supprime"""
+        now = fields.Datetime.now()
+        vals_list = []
+        for values in plannings.read(ARCHIVED_PLANNING_FIELDS, load=None):
+            values['original_id'] = values.pop('id')
+            values['archived_on'] = now
+            vals_list.append(values)
+        archives = self.with_context(**PLANNING_BULK_CONTEXT).create(vals_list)
+
+        # Messages (et valeurs suivies), abonnés et pièces jointes suivent la planification
+        moved = [
+            [values['original_id'] for values in vals_list],
+            archives.ids,
+        ]
+        self.env.flush_all()
+        for table, model_column in (
+            ('mail_message', 'model'),
+            ('mail_followers', 'res_model'),
+            ('ir_attachment', 'res_model'),
+        ):
+            self.env.cr.execute(f"""
+                UPDATE {table} AS record
+                   SET {model_column} = %s, res_id = moved.archive_id
+                  FROM unnest(%s::int[], %s::int[]) AS moved(planning_id, archive_id)
+                 WHERE record.{model_column} = 'monitor.planning'
+                   AND record.res_id = moved.planning_id
+            """, [self._name, *moved])
+        self.env['mail.message'].invalidate_model(['model', 'res_id'])
+        self.env['mail.followers'].invalidate_model(['res_model', 'res_id'])
+        self.env['ir.attachment'].invalidate_model(['res_model', 'res_id'])
+
+        # Les statistiques (moniteurs, rapports) incluent les archives : elles
+        # sont recalculées à l'identique lors de la suppression
+        plannings._with_bulk_mode().unlink()
+        return archives
+
+    @api.model
+    def _cron_archive_plannings(self):
+        """Archivage quotidien des planifications historiques"""
+        self._archive_plannings(commit=True)
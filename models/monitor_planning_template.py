@@ -8,6 +8,7 @@ import calendar
 class MonitorPlanningTemplate(models.Model):
     """Modèle pour les modèles de planification récurrente"""
     _name = "monitor.planning.template"
+    _inherit = ['mail.thread']
     _description = "Modèle de planification des moniteurs"
     _order = "name"
 
@@ -140,41 +141,79 @@ class MonitorPlanningTemplate(models.Model):
         if not self.monitor_rotation_ids:
             raise UserError("Aucun moniteur n'est configuré dans la rotation.")
         
-        plannings_created = []
-        current_date = self._get_next_occurrence(start_date)
-        monitor_index = 0
+        Planning = self.env['monitor.planning']
+        # Dates déjà planifiées pour ce modèle, en une seule requête
+        existing_dates = set(Planning.search([
+            ('template_id', '=', self.id),
+            ('planned_date', '>=', start_date),
+            ('planned_date', '<=', end_date),
+        ]).mapped('planned_date'))
         
+        dates = []
+        current_date = self._get_next_occurrence(start_date)
         while current_date and current_date <= end_date:
             # Vérifier si le modèle est encore actif à cette date
             if self.active_until and current_date > self.active_until:
                 break
-            
-            # Vérifier s'il n'existe pas déjà une planification pour cette date
-            existing = self.env['monitor.planning'].search([
-                ('template_id', '=', self.id),
-                ('planned_date', '=', current_date)
-            ], limit=1)
-            
-            if not existing:
-                # Obtenir le moniteur selon la rotation
-                rotation_line = self.monitor_rotation_ids[monitor_index % len(self.monitor_rotation_ids)]
-                
-                planning = self.env['monitor.planning'].create({
-                    'name': f"{self.name} - {current_date.strftime('%d/%m/%Y')}",
-                    'template_id': self.id,
-                    'school_id': self.school_id.id,
-                    'monitor_id': rotation_line.monitor_id.id,
-                    'planned_date': current_date,
-                    'start_time': self.start_time,
-                    'end_time': self.end_time,
-                    'state': 'planned'
-                })
-                plannings_created.append(planning)
-                monitor_index += 1
-            
+            if current_date not in existing_dates:
+                dates.append(current_date)
             # Calculer la prochaine occurrence
             current_date = self._get_next_occurrence(current_date + timedelta(days=1))
         
+        # Indisponibilités de toutes les dates en une seule requête
+        unavailable = self.env['monitor.availability.day'].sudo()._get_unavailable_monitor_ids(
+            (planned_date, planned_date, self.start_time, self.end_time) for planned_date in dates
+        )
+        rotation = self.monitor_rotation_ids
+        # Conformité (certificats exigés) de la rotation sur toute la période, en une requête
+        compliant = self.env['monitor.certificate']._get_compliant_monitor_ids(
+            rotation.monitor_id.ids, dates
+        )
+        
+        def is_eligible(monitor_id, planned_date):
+            return monitor_id not in unavailable[planned_date] and (
+                compliant is None or monitor_id in compliant[planned_date]
+            )
+        
+        vals_list, skipped_dates = [], []
+        monitor_index = 0
+        for planned_date in dates:
+            # Moniteur suivant de la rotation, en passant les moniteurs indisponibles ou
+            # non conformes ; la date est ignorée si aucun n'est éligible
+            offset = next((
+                offset for offset in range(len(rotation))
+                if is_eligible(rotation[(monitor_index + offset) % len(rotation)].monitor_id.id, planned_date)
+            ), None)
+            if offset is None:
+                skipped_dates.append(planned_date)
+                continue
+            rotation_line = rotation[(monitor_index + offset) % len(rotation)]
+            
+            vals_list.append({
+                'name': f"{self.name} - {planned_date.strftime('%d/%m/%Y')}",
+                'template_id': self.id,
+                'school_id': self.school_id.id,
+                'monitor_id': rotation_line.monitor_id.id,
+                'planned_date': planned_date,
+                'start_time': self.start_time,
+                'end_time': self.end_time,
+                'state': 'planned'
+            })
+            monitor_index += offset + 1
+        
+        # Création en masse puis un seul message récapitulatif sur le modèle
+        plannings_created = Planning._with_bulk_mode().create(vals_list)
+        if plannings_created or skipped_dates:
+            body = (
+                f"{len(plannings_created)} planifications générées du "
+                f"{start_date.strftime('%d/%m/%Y')} au {end_date.strftime('%d/%m/%Y')}."
+            )
+            if skipped_dates:
+                body += (
+                    f" Dates non planifiées (aucun moniteur de la rotation disponible et en règle) : "
+                    f"{', '.join(skipped_date.strftime('%d/%m/%Y') for skipped_date in skipped_dates)}."
+                )
+            self.message_post(body=body)
         return plannings_created
     
     def _get_next_occurrence(self, from_date):
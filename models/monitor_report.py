@@ -1,12 +1,28 @@
 from odoo import models, fields, api
+from odoo.tools import split_every
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
 from odoo.exceptions import ValidationError, UserError
+from collections import defaultdict
 import calendar
 
+# Champs calculés par _compute_activity_stats
+REPORT_STAT_FIELDS = [
+    'total_interventions',
+    'completed_interventions',
+    'cancelled_interventions',
+    'total_hours',
+    'average_participants',
+    'average_rating',
+]
+
+# Nombre de rapports créés (et validés en base par le cron) par lot
+REPORT_GENERATION_BATCH_SIZE = 200
+
 class MonitorReport(models.Model):
     """Rapports d'activité des moniteurs"""
     _name = "monitor.report"
+    _inherit = ['monitor.statistics.mixin']
     _description = "Rapport d'activité moniteur"
     _order = "report_date desc"
 
@@ -91,36 +107,129 @@ class MonitorReport(models.Model):
     
     @api.depends('monitor_id', 'period_from', 'period_to')
     def _compute_activity_stats(self):
-        for report in self:
-            if report.monitor_id and report.period_from and report.period_to:
-                plannings = self.env['monitor.planning'].search([
-                    ('monitor_id', '=', report.monitor_id.id),
-                    ('planned_date', '>=', report.period_from),
-                    ('planned_date', '<=', report.period_to)
+        # Une seule requête agrégée pour tous les rapports du lot ; les
+        # périodes sont passées depuis le cache (enregistrements non encore
+        # écrits compris). Les planifications modifiées déclenchent ce calcul
+        # via monitor.planning._trigger_report_stats().
+        reports = self.filtered(lambda r: r.monitor_id and r.period_from and r.period_to)
+        stats = {}
+        if reports:
+            # Les planifications archivées font toujours partie des périodes
+            for model in ('monitor.planning', 'monitor.planning.archive'):
+                self.env[model].flush_model([
+                    'monitor_id', 'planned_date', 'state',
+                    'duration_actual', 'actual_participants', 'rating',
                 ])
-                
-                report.total_interventions = len(plannings)
-                report.completed_interventions = len(plannings.filtered(lambda p: p.state == 'completed'))
-                report.cancelled_interventions = len(plannings.filtered(lambda p: p.state == 'cancelled'))
-                
-                completed_plannings = plannings.filtered(lambda p: p.state == 'completed')
-                if completed_plannings:
-                    report.total_hours = sum(completed_plannings.mapped('duration_actual'))
-                    report.average_participants = sum(completed_plannings.mapped('actual_participants')) / len(completed_plannings)
-                    
-                    ratings = [int(p.rating) for p in completed_plannings if p.rating]
-                    report.average_rating = sum(ratings) / len(ratings) if ratings else 0
-                else:
-                    report.total_hours = 0
-                    report.average_participants = 0
-                    report.average_rating = 0
-            else:
-                report.total_interventions = 0
-                report.completed_interventions = 0
-                report.cancelled_interventions = 0
-                report.total_hours = 0
-                report.average_participants = 0
-                report.average_rating = 0
+            self.env.cr.execute("""
+                SELECT report.key,
+                       COUNT(planning.id),
+                       COUNT(planning.id) FILTER (WHERE planning.state = 'completed'),
+                       COUNT(planning.id) FILTER (WHERE planning.state = 'cancelled'),
+                       SUM(planning.duration_actual) FILTER (WHERE planning.state = 'completed'),
+                       AVG(COALESCE(planning.actual_participants, 0)) FILTER (WHERE planning.state = 'completed'),
+                       AVG(NULLIF(planning.rating, '')::integer) FILTER (WHERE planning.state = 'completed')
+                  FROM unnest(%s::int[], %s::int[], %s::date[], %s::date[])
+                       AS report(key, monitor_id, period_from, period_to)
+                  JOIN (
+                        SELECT id, monitor_id, planned_date, state, duration_actual, actual_participants, rating
+                          FROM monitor_planning
+                     UNION ALL
+                        SELECT id, monitor_id, planned_date, state, duration_actual, actual_participants, rating
+                          FROM monitor_planning_archive
+                       ) planning
+                    ON planning.monitor_id = report.monitor_id
+                   AND planning.planned_date BETWEEN report.period_from AND report.period_to
+              GROUP BY report.key
+            """, [
+                list(range(len(reports))),
+                [report.monitor_id.id for report in reports],
+                [report.period_from for report in reports],
+                [report.period_to for report in reports],
+            ])
+            stats = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+        for index, report in enumerate(reports):
+            total, completed, cancelled, hours, participants, rating = stats.get(
+                index, (0, 0, 0, 0, 0, 0)
+            )
+            report.total_interventions = total
+            report.completed_interventions = completed
+            report.cancelled_interventions = cancelled
+            report.total_hours = hours or 0
+            report.average_participants = float(participants or 0)
+            report.average_rating = float(rating or 0)
+
+        for report in self - reports:
+            report.total_interventions = 0
+            report.completed_interventions = 0
+            report.cancelled_interventions = 0
+            report.total_hours = 0
+            report.average_participants = 0
+            report.average_rating = 0
+    
+    @api.model
+    def _get_reports_covering(self, monitor_dates):
+        """Rapports dont le moniteur et la période couvrent l'un des couples (moniteur, date)"""
+        dates_by_monitor = defaultdict(set)
+        for monitor_id, planned_date in monitor_dates:
+            if monitor_id and planned_date:
+                dates_by_monitor[monitor_id].add(planned_date)
+        if not dates_by_monitor:
+            return self.browse()
+        all_dates = set().union(*dates_by_monitor.values())
+        candidates = self.sudo().search([
+            ('monitor_id', 'in', list(dates_by_monitor)),
+            ('period_from', '<=', max(all_dates)),
+            ('period_to', '>=', min(all_dates)),
+        ])
+        return candidates.filtered(lambda report: any(
+            report.period_from <= planned_date <= report.period_to
+            for planned_date in dates_by_monitor[report.monitor_id.id]
+        ))
+    
+    def _recompute_activity_stats(self):
+        """Marque les statistiques de ces rapports à recalculer"""
+        for field_name in REPORT_STAT_FIELDS:
+            self.env.add_to_compute(self._fields[field_name], self)
+    
+    @api.model
+    def _generate_period_reports(self, period_from, period_to, monitors=None, commit=False):
+        """Crée les rapports brouillons d'une période pour tous les moniteurs actifs.
+
+        Les moniteurs ayant déjà un rapport pour cette période sont ignorés ;
+        les statistiques de chaque lot sont calculées en une seule requête.
+        """
+        if monitors is None:
+            monitors = self.env['res.partner'].search([('is_monitor', '=', True)])
+        existing_monitor_ids = {
+            monitor.id
+            for [monitor] in self._read_group([
+                ('monitor_id', 'in', monitors.ids),
+                ('period_from', '=', period_from),
+                ('period_to', '=', period_to),
+            ], ['monitor_id'])
+        }
+        monitor_ids = [monitor_id for monitor_id in monitors.ids if monitor_id not in existing_monitor_ids]
+
+        reports = self.browse()
+        for batch_ids in split_every(REPORT_GENERATION_BATCH_SIZE, monitor_ids):
+            batch = self.create([{
+                'monitor_id': monitor_id,
+                'period_from': period_from,
+                'period_to': period_to,
+            } for monitor_id in batch_ids])
+            batch.flush_recordset()
+            reports |= batch
+            if commit:
+                self.env.cr.commit()
+        return reports
+    
+    @api.model
+    def _cron_generate_monthly_reports(self):
+        """Génère les rapports du mois précédent (à planifier en début de mois)"""
+        period_to = fields.Date.today().replace(day=1) - timedelta(days=1)
+        period_from = period_to.replace(day=1)
+        self._generate_period_reports(period_from, period_to, commit=True)
     
     def action_submit(self):
         """Soumettre le rapport"""
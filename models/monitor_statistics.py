@@ -0,0 +1,195 @@
+from odoo import models, fields, api
+from odoo.exceptions import AccessError
+
+# Statistiques de res.partner matérialisées dans monitor.statistics
+MONITOR_STATISTICS_FIELDS = [
+    'planning_count',
+    'completed_planning_count',
+    'upcoming_planning_count',
+    'substitute_count',
+    'availability_count',
+    'evaluation_count',
+    'training_count',
+    'certificate_count',
+    'report_count',
+    'last_evaluation_date',
+    'last_training_date',
+    'average_evaluation_rating',
+]
+
+# Nombre de moniteurs recalculés par lot lors d'une reconstruction complète
+REBUILD_BATCH_SIZE = 500
+
+
+class MonitorStatistics(models.Model):
+    """Statistiques matérialisées par moniteur (triables et filtrables)"""
+    _name = "monitor.statistics"
+    _description = "Statistiques moniteur"
+    _order = "planning_count desc, monitor_id"
+    _rec_name = "monitor_id"
+
+    monitor_id = fields.Many2one(
+        'res.partner',
+        string="Moniteur",
+        required=True,
+        ondelete='cascade',
+        index=True
+    )
+
+    planning_count = fields.Integer(string="Nombre de planifications", readonly=True)
+    completed_planning_count = fields.Integer(string="Interventions terminées", readonly=True)
+    upcoming_planning_count = fields.Integer(string="Interventions à venir", readonly=True)
+    substitute_count = fields.Integer(string="Remplacements effectués", readonly=True)
+    availability_count = fields.Integer(string="Disponibilités déclarées", readonly=True)
+    evaluation_count = fields.Integer(string="Évaluations reçues", readonly=True)
+    training_count = fields.Integer(string="Formations suivies", readonly=True)
+    certificate_count = fields.Integer(string="Certificats obtenus", readonly=True)
+    report_count = fields.Integer(string="Rapports soumis", readonly=True)
+    last_evaluation_date = fields.Date(string="Dernière évaluation", readonly=True)
+    last_training_date = fields.Date(string="Dernière formation", readonly=True)
+    average_evaluation_rating = fields.Float(string="Note moyenne d'évaluation", readonly=True)
+
+    last_refresh = fields.Datetime(string="Dernière mise à jour", readonly=True)
+
+    _sql_constraints = [
+        ('monitor_uniq', 'unique(monitor_id)', "Les statistiques d'un moniteur doivent être uniques."),
+    ]
+
+    @api.model
+    def _refresh_monitors(self, monitor_ids):
+        """Recalcule les statistiques des moniteurs donnés.
+
+        Les valeurs proviennent des champs calculés par lot de res.partner ;
+        les lignes des partenaires qui ne sont plus moniteurs sont supprimées.
+        """
+        if not monitor_ids:
+            return
+        self = self.sudo()
+        Partner = self.env['res.partner'].sudo()
+
+        # Les champs non stockés restent en cache pendant la transaction
+        Partner.invalidate_model(MONITOR_STATISTICS_FIELDS)
+        partners = Partner.browse(list(monitor_ids)).exists()
+        monitors = partners.filtered('is_monitor')
+
+        self.search([('monitor_id', 'in', (partners - monitors).ids)]).unlink()
+        self._upsert_rows(monitors.read(MONITOR_STATISTICS_FIELDS))
+
+    @api.model
+    def _upsert_rows(self, rows):
+        """Crée ou met à jour les lignes des moniteurs en une seule requête
+
+        ``rows`` est le résultat de res.partner.read(MONITOR_STATISTICS_FIELDS).
+        INSERT ... ON CONFLICT évite l'échec d'une transaction concurrente qui
+        créerait la même ligne (contrainte unique sur monitor_id).
+        """
+        if not rows:
+            return
+        columns = MONITOR_STATISTICS_FIELDS
+        column_values = [
+            # read() renvoie False pour les dates vides
+            [row[column] or None for row in rows]
+            if self._fields[column].type in ('date', 'datetime')
+            else [row[column] for row in rows]
+            for column in columns
+        ]
+        self.flush_model()
+        self.env.cr.execute(f"""
+            INSERT INTO {self._table} (monitor_id, {', '.join(columns)},
+                                       last_refresh, create_uid, create_date, write_uid, write_date)
+            SELECT refreshed.*, clock.stamp, %s, clock.stamp, %s, clock.stamp
+              FROM unnest(%s::int[], {', '.join(f'%s::{self._fields[column].column_type[1]}[]' for column in columns)})
+                   AS refreshed(monitor_id, {', '.join(columns)})
+             CROSS JOIN (SELECT now() at time zone 'UTC') AS clock(stamp)
+            ON CONFLICT (monitor_id) DO UPDATE
+               SET {', '.join(f'{column} = EXCLUDED.{column}' for column in columns)},
+                   last_refresh = EXCLUDED.last_refresh,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, [
+            self.env.uid,
+            self.env.uid,
+            [row['id'] for row in rows],
+            *column_values,
+        ])
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild_all(self, commit=False):
+        """Reconstruction complète des statistiques de tous les moniteurs
+
+        Avec ``commit``, chaque lot est validé séparément : une modification
+        concurrente ne fait échouer (et recommencer) que son lot.
+        """
+        self = self.sudo()
+        monitors = self.env['res.partner'].sudo().search([('is_monitor', '=', True)])
+        self.search([('monitor_id', 'not in', monitors.ids)]).unlink()
+        if commit:
+            self.env.cr.commit()
+        for start in range(0, len(monitors), REBUILD_BATCH_SIZE):
+            self._refresh_monitors(monitors[start:start + REBUILD_BATCH_SIZE].ids)
+            if commit:
+                self.env.cr.commit()
+
+    def action_rebuild_all(self):
+        """Bouton : reconstruire toutes les statistiques (responsables uniquement)"""
+        if not (self.env.is_admin() or self.env.user.has_group('monitor_planning.group_monitor_manager')):
+            raise AccessError("Seul un responsable peut reconstruire toutes les statistiques.")
+        self._rebuild_all()
+        return {'type': 'ir.actions.client', 'tag': 'reload'}
+
+    @api.model
+    def _cron_rebuild_statistics(self):
+        """Reconstruction quotidienne (les interventions à venir dépendent de la date)"""
+        self._rebuild_all(commit=True)
+
+    @api.model
+    def _mark_monitors_dirty(self, monitor_ids):
+        """Programme le recalcul des statistiques des moniteurs donnés
+
+        Appelé à chaque modification des enregistrements suivis : la file
+        d'attente ne reçoit que des insertions (aucun verrou sur les lignes de
+        statistiques partagées) et la tâche planifiée est déclenchée une fois
+        par transaction, pour s'exécuter après sa validation.
+        """
+        if not monitor_ids:
+            return
+        self.env['monitor.statistics.queue'].sudo().create([
+            {'monitor_id': monitor_id} for monitor_id in monitor_ids
+        ])
+        if not self.env.cr.precommit.data.get('monitor_statistics_triggered'):
+            self.env.cr.precommit.data['monitor_statistics_triggered'] = True
+            cron = self.env.ref('monitor_planning.ir_cron_refresh_monitor_statistics', raise_if_not_found=False)
+            if cron:
+                cron.sudo()._trigger()
+
+    @api.model
+    def _cron_refresh_dirty_monitors(self):
+        """Recalcule les statistiques des moniteurs en attente, un lot validé à la fois"""
+        Queue = self.env['monitor.statistics.queue']
+        while True:
+            # SKIP LOCKED : les entrées ajoutées pendant le traitement restent en file
+            self.env.cr.execute(f"""
+                DELETE FROM {Queue._table}
+                 WHERE id IN (
+                       SELECT id FROM {Queue._table}
+                        ORDER BY id
+                        LIMIT %s
+                          FOR UPDATE SKIP LOCKED
+                 )
+             RETURNING monitor_id
+            """, [REBUILD_BATCH_SIZE])
+            monitor_ids = {monitor_id for [monitor_id] in self.env.cr.fetchall()}
+            if not monitor_ids:
+                break
+            self._refresh_monitors(monitor_ids)
+            self.env.cr.commit()
+
+
+class MonitorStatisticsQueue(models.Model):
+    """Moniteurs dont les statistiques doivent être recalculées"""
+    _name = "monitor.statistics.queue"
+    _description = "File de recalcul des statistiques moniteur"
+    _log_access = False
+
+    monitor_id = fields.Integer(string="Moniteur", required=True)
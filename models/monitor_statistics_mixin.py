@@ -0,0 +1,45 @@
+from odoo import models, api
+
+
+class MonitorStatisticsMixin(models.AbstractModel):
+    """Mise à jour incrémentale des statistiques matérialisées des moniteurs
+
+    Les moniteurs concernés sont mis en file d'attente ; le recalcul est fait
+    par la tâche planifiée, hors de la transaction de l'utilisateur.
+    """
+    _name = "monitor.statistics.mixin"
+    _description = "Mise à jour des statistiques moniteur"
+
+    # Champs dont la modification impacte les statistiques des moniteurs
+    _monitor_statistics_fields = ('monitor_id',)
+    # Champs res.partner désignant les moniteurs concernés par l'enregistrement
+    _monitor_statistics_partner_fields = ('monitor_id',)
+
+    def _get_statistics_monitor_ids(self):
+        """Retourne les ids des moniteurs concernés par ces enregistrements"""
+        monitor_ids = set()
+        for field_name in self._monitor_statistics_partner_fields:
+            monitor_ids.update(self.mapped(field_name).ids)
+        return monitor_ids
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['monitor.statistics']._mark_monitors_dirty(records._get_statistics_monitor_ids())
+        return records
+
+    def write(self, vals):
+        if not set(vals) & set(self._monitor_statistics_fields):
+            return super().write(vals)
+        # Moniteurs avant et après modification (changement d'affectation)
+        monitor_ids = self._get_statistics_monitor_ids()
+        result = super().write(vals)
+        monitor_ids |= self._get_statistics_monitor_ids()
+        self.env['monitor.statistics']._mark_monitors_dirty(monitor_ids)
+        return result
+
+    def unlink(self):
+        monitor_ids = self._get_statistics_monitor_ids()
+        result = super().unlink()
+        self.env['monitor.statistics']._mark_monitors_dirty(monitor_ids)
+        return result
@@ -7,8 +7,11 @@ import calendar
 class MonitorTraining(models.Model):
     """Formation des moniteurs"""
     _name = "monitor.training"
+    _inherit = ['monitor.statistics.mixin']
     _description = "Formation moniteur"
     _order = "date desc"
+    _monitor_statistics_fields = ('participant_ids', 'date')
+    _monitor_statistics_partner_fields = ('participant_ids',)
 
     name = fields.Char(string="Nom de la formation", required=True)
     description = fields.Text(string="Description")
@@ -79,12 +82,13 @@ class MonitorTraining(models.Model):
             self._create_certificates()
     
     def _create_certificates(self):
-        """Crée des certificats de formation pour les participants"""
-        for participant in self.participant_ids:
-            self.env['monitor.certificate'].create({
-                'monitor_id': participant.id,
-                'training_id': self.id,
-                'certificate_date': fields.Date.today(),
-                'certificate_type': 'training',
-                'description': f"Certificat de participation à la formation : {self.name}"
-            })
\ No newline at end of file
+        """Crée des certificats de formation pour les participants (en une seule création)"""
+        today = fields.Date.today()
+        return self.env['monitor.certificate'].create([{
+            'name': f"Certificat - {self.name}",
+            'monitor_id': participant.id,
+            'training_id': self.id,
+            'certificate_date': today,
+            'certificate_type': 'training',
+            'description': f"Certificat de participation à la formation : {self.name}"
+        } for participant in self.participant_ids])
\ No newline at end of file
@@ -2,6 +2,7 @@ from odoo import models, fields, api
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
 from odoo.exceptions import ValidationError, UserError
+from collections import defaultdict
 import calendar
 
 # Extension du modèle res.partner pour ajouter les statistiques de planification
@@ -60,41 +61,61 @@ class ResPartner(models.Model):
 
     @api.depends()
     def _compute_monitor_planning_stats(self):
-        for partner in self:
-            if partner.is_monitor:
-                # Planifications principales
-                partner.planning_count = self.env["monitor.planning"].search_count(
-                    [("monitor_id", "=", partner.id)]
-                )
-
-                partner.completed_planning_count = self.env[
-                    "monitor.planning"
-                ].search_count(
-                    [("monitor_id", "=", partner.id), ("state", "=", "completed")]
-                )
-
-                partner.upcoming_planning_count = self.env[
-                    "monitor.planning"
-                ].search_count(
+        # Compteurs de tout le lot calculés par agrégats groupés, sans
+        # requête par partenaire
+        monitor_ids = self.filtered("is_monitor")._origin.ids
+        planning_counts = defaultdict(int)
+        completed_counts = defaultdict(int)
+        upcoming_counts = {}
+        substitute_counts = defaultdict(int)
+
+        if monitor_ids:
+            Planning = self.env["monitor.planning"]
+            # Les planifications archivées restent comptabilisées
+            PlanningArchive = self.env["monitor.planning.archive"]
+
+            # Planifications principales, par moniteur et par état
+            for model in (Planning, PlanningArchive):
+                for monitor, state, count in model._read_group(
+                    [("monitor_id", "in", monitor_ids)],
+                    ["monitor_id", "state"],
+                    ["__count"],
+                ):
+                    planning_counts[monitor.id] += count
+                    if state == "completed":
+                        completed_counts[monitor.id] += count
+
+            upcoming_counts = {
+                monitor.id: count
+                for monitor, count in Planning._read_group(
                     [
-                        ("monitor_id", "=", partner.id),
+                        ("monitor_id", "in", monitor_ids),
                         ("state", "in", ["planned", "confirmed"]),
                         ("planned_date", ">=", fields.Date.today()),
-                    ]
+                    ],
+                    ["monitor_id"],
+                    ["__count"],
                 )
+            }
 
-                # Remplacements
-                partner.substitute_count = self.env["monitor.planning"].search_count(
+            # Remplacements
+            for model in (Planning, PlanningArchive):
+                for monitor, count in model._read_group(
                     [
-                        ("substitute_monitor_id", "=", partner.id),
+                        ("substitute_monitor_id", "in", monitor_ids),
                         ("state", "=", "completed"),
-                    ]
-                )
-            else:
-                partner.planning_count = 0
-                partner.completed_planning_count = 0
-                partner.upcoming_planning_count = 0
-                partner.substitute_count = 0
+                    ],
+                    ["substitute_monitor_id"],
+                    ["__count"],
+                ):
+                    substitute_counts[monitor.id] += count
+
+        for partner in self:
+            partner_id = partner._origin.id if partner.is_monitor else False
+            partner.planning_count = planning_counts.get(partner_id, 0)
+            partner.completed_planning_count = completed_counts.get(partner_id, 0)
+            partner.upcoming_planning_count = upcoming_counts.get(partner_id, 0)
+            partner.substitute_count = substitute_counts.get(partner_id, 0)
 
     def action_view_monitor_plannings(self):
         """Action pour voir les planifications du moniteur"""
@@ -134,59 +155,85 @@ class ResPartner(models.Model):
 
     @api.depends()
     def _compute_extended_monitor_stats(self):
-        for partner in self:
-            if partner.is_monitor:
-                # Disponibilités
-                partner.availability_count = self.env[
-                    "monitor.availability"
-                ].search_count([("monitor_id", "=", partner.id)])
-
-                # Évaluations
-                evaluations = self.env["monitor.evaluation"].search(
-                    [("monitor_id", "=", partner.id)]
+        # Une requête agrégée par modèle pour tout le lot de partenaires
+        monitor_ids = self.filtered("is_monitor")._origin.ids
+        availability_counts = {}
+        evaluation_stats = {}
+        training_stats = {}
+        certificate_counts = {}
+        report_counts = {}
+
+        if monitor_ids:
+            domain = [("monitor_id", "in", monitor_ids)]
+
+            # Disponibilités
+            availability_counts = {
+                monitor.id: count
+                for monitor, count in self.env["monitor.availability"]._read_group(
+                    domain, ["monitor_id"], ["__count"]
                 )
-                partner.evaluation_count = len(evaluations)
-
-                if evaluations:
-                    partner.last_evaluation_date = max(
-                        evaluations.mapped("evaluation_date")
-                    )
-                    partner.average_evaluation_rating = sum(
-                        evaluations.mapped("overall_rating")
-                    ) / len(evaluations)
-                else:
-                    partner.last_evaluation_date = False
-                    partner.average_evaluation_rating = 0.0
-
-                # Formations
-                trainings = self.env["monitor.training"].search(
-                    [("participant_ids", "in", partner.id)]
+            }
+
+            # Évaluations : nombre, dernière date et note moyenne
+            evaluation_stats = {
+                monitor.id: (count, last_date, average)
+                for monitor, count, last_date, average in self.env[
+                    "monitor.evaluation"
+                ]._read_group(
+                    domain,
+                    ["monitor_id"],
+                    ["__count", "evaluation_date:max", "overall_rating:avg"],
                 )
-                partner.training_count = len(trainings)
-
-                if trainings:
-                    partner.last_training_date = max(trainings.mapped("date"))
-                else:
-                    partner.last_training_date = False
-
-                # Certificats
-                partner.certificate_count = self.env[
-                    "monitor.certificate"
-                ].search_count([("monitor_id", "=", partner.id)])
+            }
+
+            # Formations : une seule requête sur la table de participation
+            self.env["monitor.training"].flush_model(["date", "participant_ids"])
+            self.env.cr.execute(
+                """
+                SELECT rel.monitor_id, COUNT(*), MAX(training.date)
+                  FROM training_participant_rel rel
+                  JOIN monitor_training training ON training.id = rel.training_id
+                 WHERE rel.monitor_id = ANY(%s)
+              GROUP BY rel.monitor_id
+                """,
+                [monitor_ids],
+            )
+            training_stats = {
+                monitor_id: (count, last_date)
+                for monitor_id, count, last_date in self.env.cr.fetchall()
+            }
+
+            # Certificats
+            certificate_counts = {
+                monitor.id: count
+                for monitor, count in self.env["monitor.certificate"]._read_group(
+                    domain, ["monitor_id"], ["__count"]
+                )
+            }
 
-                # Rapports
-                partner.report_count = self.env["monitor.report"].search_count(
-                    [("monitor_id", "=", partner.id)]
+            # Rapports
+            report_counts = {
+                monitor.id: count
+                for monitor, count in self.env["monitor.report"]._read_group(
+                    domain, ["monitor_id"], ["__count"]
                 )
-            else:
-                partner.availability_count = 0
-                partner.evaluation_count = 0
-                partner.training_count = 0
-                partner.certificate_count = 0
-                partner.report_count = 0
-                partner.last_evaluation_date = False
-                partner.last_training_date = False
-                partner.average_evaluation_rating = 0.0
+            }
+
+        for partner in self:
+            partner_id = partner._origin.id if partner.is_monitor else False
+            evaluation_count, last_evaluation_date, average_rating = evaluation_stats.get(
+                partner_id, (0, False, 0.0)
+            )
+            training_count, last_training_date = training_stats.get(partner_id, (0, False))
+
+            partner.availability_count = availability_counts.get(partner_id, 0)
+            partner.evaluation_count = evaluation_count
+            partner.last_evaluation_date = last_evaluation_date or False
+            partner.average_evaluation_rating = average_rating or 0.0
+            partner.training_count = training_count
+            partner.last_training_date = last_training_date or False
+            partner.certificate_count = certificate_counts.get(partner_id, 0)
+            partner.report_count = report_counts.get(partner_id, 0)
 
     def action_view_monitor_availabilities(self):
         """Action pour voir les disponibilités du moniteur"""
@@ -3,6 +3,14 @@
  * Améliore l'interactivité et l'expérience utilisateur
  */
 
+const MONTH_NAMES = [
+    'Janvier', 'Février', 'Mars', 'Avril', 'Mai', 'Juin',
+    'Juillet', 'Août', 'Septembre', 'Octobre', 'Novembre', 'Décembre'
+];
+
+// Nombre maximum de mois conservés en mémoire
+const MONTH_CACHE_SIZE = 12;
+
 class MonitorPlanningCalendar {
     constructor() {
         this.currentDate = new Date();
@@ -12,6 +20,13 @@ class MonitorPlanningCalendar {
             monitor_id: '',
             school_id: ''
         };
+
+        // Cache LRU des mois visités (clé -> données de l'API)
+        this.monthCache = new Map();
+        // Requêtes en cours, pour ne jamais charger deux fois le même mois
+        this.pendingRequests = new Map();
+        // Jeton de la dernière navigation, pour ignorer les réponses obsolètes
+        this.navigationToken = 0;
         
         this.init();
     }
@@ -21,6 +36,7 @@ class MonitorPlanningCalendar {
         this.setupAccessibility();
         this.setupKeyboardNavigation();
         this.loadSavedFilters();
+        this.setupHistory();
     }
 
     /**
@@ -41,6 +57,22 @@ class MonitorPlanningCalendar {
             }
         });
 
+        // Navigation mois précédent/suivant sans rechargement
+        document.querySelectorAll('[data-month-nav]').forEach(link => {
+            link.addEventListener('click', (e) => {
+                e.preventDefault();
+                this.navigateMonth(parseInt(link.getAttribute('data-month-nav')));
+            });
+        });
+
+        const resetLink = document.querySelector('.calendar-reset');
+        if (resetLink) {
+            resetLink.addEventListener('click', (e) => {
+                e.preventDefault();
+                this.resetFilters();
+            });
+        }
+
         // Filtres
         const filterForm = document.querySelector('form[method="get"]');
         if (filterForm) {
@@ -102,8 +134,10 @@ class MonitorPlanningCalendar {
      * Gérer la soumission des filtres
      */
     handleFilterSubmit(e) {
-        this.showLoading(true);
+        e.preventDefault();
         this.saveFilters();
+        const { year, month } = this.getDisplayedMonth();
+        this.showMonth(year, month);
     }
 
     /**
@@ -333,12 +367,27 @@ class MonitorPlanningCalendar {
      * Naviguer d'un mois
      */
     navigateMonth(direction) {
-        const currentYear = parseInt(document.querySelector('input[name="year"]')?.value || new Date().getFullYear());
-        const currentMonth = parseInt(document.querySelector('input[name="month"]')?.value || new Date().getMonth() + 1);
-        
-        let newMonth = currentMonth + direction;
-        let newYear = currentYear;
-        
+        const { year, month } = this.shiftMonth(this.getDisplayedMonth(), direction);
+        this.showMonth(year, month);
+    }
+
+    /**
+     * Mois actuellement affiché (lu dans les champs cachés du formulaire)
+     */
+    getDisplayedMonth() {
+        return {
+            year: parseInt(document.querySelector('input[name="year"]')?.value || new Date().getFullYear()),
+            month: parseInt(document.querySelector('input[name="month"]')?.value || new Date().getMonth() + 1)
+        };
+    }
+
+    /**
+     * Décaler un mois de `direction` mois
+     */
+    shiftMonth({ year, month }, direction) {
+        let newMonth = month + direction;
+        let newYear = year;
+
         if (newMonth > 12) {
             newMonth = 1;
             newYear++;
@@ -346,13 +395,329 @@ class MonitorPlanningCalendar {
             newMonth = 12;
             newYear--;
         }
-        
-        // Conserver les filtres actuels
-        const params = new URLSearchParams(window.location.search);
-        params.set('year', newYear);
-        params.set('month', newMonth);
-        
-        window.location.href = `/monitor/planning/calendar?${params.toString()}`;
+        return { year: newYear, month: newMonth };
+    }
+
+    /**
+     * Filtres actuellement sélectionnés dans le formulaire
+     */
+    getCurrentFilters() {
+        const filters = {};
+        ['status', 'monitor_id', 'school_id'].forEach(key => {
+            const value = document.querySelector(`select[name="${key}"]`)?.value;
+            if (value) {
+                filters[key] = value;
+            }
+        });
+        return filters;
+    }
+
+    /**
+     * Construire la clé de cache d'un mois pour un jeu de filtres
+     */
+    getCacheKey(year, month, filters) {
+        const filterKey = Object.keys(filters).sort().map(key => `${key}=${filters[key]}`).join('&');
+        return `${year}-${month}?${filterKey}`;
+    }
+
+    /**
+     * Récupérer les données d'un mois (cache, requête en cours ou API)
+     */
+    fetchMonth(year, month, filters) {
+        const key = this.getCacheKey(year, month, filters);
+
+        if (this.monthCache.has(key)) {
+            // Replacer l'entrée en fin de Map : elle devient la plus récente
+            const data = this.monthCache.get(key);
+            this.monthCache.delete(key);
+            this.monthCache.set(key, data);
+            return Promise.resolve(data);
+        }
+
+        if (this.pendingRequests.has(key)) {
+            return this.pendingRequests.get(key);
+        }
+
+        const request = fetch('/monitor/planning/api/calendar-data', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                jsonrpc: '2.0',
+                method: 'call',
+                params: Object.assign({ year, month }, filters)
+            })
+        })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.json();
+            })
+            .then(payload => {
+                const data = payload.result;
+                if (payload.error || !data || data.error) {
+                    throw new Error((data && data.error) || 'Réponse invalide du serveur');
+                }
+                this.storeMonth(key, data);
+                return data;
+            })
+            .finally(() => {
+                this.pendingRequests.delete(key);
+            });
+
+        this.pendingRequests.set(key, request);
+        return request;
+    }
+
+    /**
+     * Ajouter un mois au cache en évinçant le moins récemment utilisé
+     */
+    storeMonth(key, data) {
+        this.monthCache.set(key, data);
+        while (this.monthCache.size > MONTH_CACHE_SIZE) {
+            this.monthCache.delete(this.monthCache.keys().next().value);
+        }
+    }
+
+    /**
+     * Précharger en arrière-plan les mois adjacents
+     */
+    prefetchAdjacentMonths(year, month, filters) {
+        const prefetch = () => {
+            [-1, 1].forEach(direction => {
+                const target = this.shiftMonth({ year, month }, direction);
+                this.fetchMonth(target.year, target.month, filters).catch(() => {
+                    // Un échec de préchargement n'est pas bloquant
+                });
+            });
+        };
+
+        if ('requestIdleCallback' in window) {
+            window.requestIdleCallback(prefetch);
+        } else {
+            setTimeout(prefetch, 200);
+        }
+    }
+
+    /**
+     * Afficher un mois : rendu côté client à partir de l'API
+     */
+    showMonth(year, month, { pushState = true } = {}) {
+        const filters = this.getCurrentFilters();
+        const token = ++this.navigationToken;
+        this.showLoading(true);
+
+        return this.fetchMonth(year, month, filters)
+            .then(data => {
+                if (token !== this.navigationToken) {
+                    return;
+                }
+                this.renderMonth(year, month, data);
+                if (pushState) {
+                    window.history.pushState({ year, month, filters }, '', this.buildCalendarUrl(year, month, filters));
+                }
+                this.prefetchAdjacentMonths(year, month, filters);
+            })
+            .catch(error => {
+                console.warn('Chargement du mois impossible, rechargement de la page:', error);
+                window.location.href = this.buildCalendarUrl(year, month, filters);
+            })
+            .finally(() => {
+                if (token === this.navigationToken) {
+                    this.showLoading(false);
+                }
+            });
+    }
+
+    /**
+     * Construire l'URL du calendrier (repli sans JavaScript et historique)
+     */
+    buildCalendarUrl(year, month, filters) {
+        const params = new URLSearchParams(filters);
+        params.set('year', year);
+        params.set('month', month);
+        return `/monitor/planning/calendar?${params.toString()}`;
+    }
+
+    /**
+     * Gérer les boutons précédent/suivant du navigateur
+     */
+    setupHistory() {
+        if (!document.querySelector('.calendar-table')) return;
+
+        const { year, month } = this.getDisplayedMonth();
+        const filters = this.getCurrentFilters();
+        window.history.replaceState({ year, month, filters }, '', window.location.href);
+
+        window.addEventListener('popstate', (e) => {
+            if (!e.state || !e.state.year) return;
+            ['status', 'monitor_id', 'school_id'].forEach(key => {
+                const select = document.querySelector(`select[name="${key}"]`);
+                if (select) {
+                    select.value = e.state.filters[key] || '';
+                }
+            });
+            this.showMonth(e.state.year, e.state.month, { pushState: false });
+        });
+
+        this.prefetchAdjacentMonths(year, month, filters);
+    }
+
+    /**
+     * Rendre le mois dans le tableau, l'en-tête et le résumé
+     */
+    renderMonth(year, month, data) {
+        const tbody = document.querySelector('.calendar-table tbody');
+        if (!tbody) return;
+
+        const dailyPlannings = data.daily_plannings || {};
+        const firstDay = new Date(year, month - 1, 1);
+        const lastDay = new Date(year, month, 0);
+        const today = this.formatDateKey(new Date());
+
+        // Du lundi précédant le 1er au dimanche suivant le dernier jour
+        const calendarStart = new Date(firstDay);
+        calendarStart.setDate(firstDay.getDate() - ((firstDay.getDay() + 6) % 7));
+        const calendarEnd = new Date(lastDay);
+        calendarEnd.setDate(lastDay.getDate() + (6 - ((lastDay.getDay() + 6) % 7)));
+
+        const fragment = document.createDocumentFragment();
+        const cursor = new Date(calendarStart);
+        while (cursor <= calendarEnd) {
+            const row = document.createElement('tr');
+            row.className = 'calendar-week';
+            for (let dayOffset = 0; dayOffset < 7; dayOffset++) {
+                const dateKey = this.formatDateKey(cursor);
+                row.appendChild(this.renderDay(cursor, dateKey, {
+                    isCurrentMonth: cursor.getMonth() === month - 1,
+                    isToday: dateKey === today,
+                    isWeekend: dayOffset >= 5,
+                    plannings: dailyPlannings[dateKey] || []
+                }));
+                cursor.setDate(cursor.getDate() + 1);
+            }
+            fragment.appendChild(row);
+        }
+
+        tbody.replaceChildren(fragment);
+        this.renderHeader(year, month);
+        this.renderStatistics(data.statistics || {});
+        this.setupAccessibility();
+    }
+
+    /**
+     * Rendre une cellule de jour (même structure que le template QWeb)
+     */
+    renderDay(date, dateKey, { isCurrentMonth, isToday, isWeekend, plannings }) {
+        const cell = document.createElement('td');
+        cell.className = 'calendar-day p-2'
+            + (isCurrentMonth ? '' : ' other-month')
+            + (isToday ? ' today-highlight' : '')
+            + (isWeekend && isCurrentMonth ? ' weekend-day' : '');
+        cell.setAttribute('data-date', dateKey);
+
+        const header = document.createElement('div');
+        header.className = 'd-flex justify-content-between align-items-start mb-1';
+        const dayNumber = document.createElement('span');
+        dayNumber.className = 'day-number' + (isToday ? ' text-primary' : '');
+        dayNumber.textContent = date.getDate();
+        header.appendChild(dayNumber);
+        if (plannings.length) {
+            const badge = document.createElement('span');
+            badge.className = 'badge bg-primary rounded-pill small';
+            badge.textContent = plannings.length;
+            header.appendChild(badge);
+        }
+        cell.appendChild(header);
+
+        if (plannings.length) {
+            const container = document.createElement('div');
+            container.className = 'planning-container';
+            plannings.slice(0, 4).forEach(planning => {
+                container.appendChild(this.renderPlanningItem(planning));
+            });
+            if (plannings.length > 4) {
+                const more = document.createElement('div');
+                more.className = 'text-center mt-1';
+                const small = document.createElement('small');
+                small.className = 'text-muted';
+                small.textContent = `+${plannings.length - 4} autres`;
+                more.appendChild(small);
+                container.appendChild(more);
+            }
+            cell.appendChild(container);
+        }
+        return cell;
+    }
+
+    /**
+     * Rendre une planification dans une cellule
+     */
+    renderPlanningItem(planning) {
+        const stateClass = ['planned', 'confirmed', 'completed'].includes(planning.state)
+            ? `state-${planning.state}`
+            : 'state-cancelled';
+
+        const item = document.createElement('div');
+        item.className = `planning-item small ${stateClass}`;
+        item.setAttribute('data-planning-id', planning.id);
+        item.setAttribute('title', `${planning.monitor} - ${planning.school}`);
+
+        if (planning.time && planning.time !== '00:00') {
+            const time = document.createElement('span');
+            time.className = 'fw-bold';
+            time.textContent = planning.time;
+            item.appendChild(time);
+        }
+
+        const monitor = document.createElement('div');
+        monitor.className = 'text-truncate';
+        monitor.textContent = (planning.monitor || '').slice(0, 12);
+        item.appendChild(monitor);
+        return item;
+    }
+
+    /**
+     * Mettre à jour le titre, les liens de navigation et les champs cachés
+     */
+    renderHeader(year, month) {
+        const title = document.querySelector('.calendar-month-name');
+        if (title) {
+            title.textContent = `${MONTH_NAMES[month - 1]} ${year}`;
+        }
+
+        const yearInput = document.querySelector('input[name="year"]');
+        const monthInput = document.querySelector('input[name="month"]');
+        if (yearInput) yearInput.value = year;
+        if (monthInput) monthInput.value = month;
+
+        document.querySelectorAll('[data-month-nav]').forEach(link => {
+            const target = this.shiftMonth({ year, month }, parseInt(link.getAttribute('data-month-nav')));
+            link.setAttribute('href', this.buildCalendarUrl(target.year, target.month, {}));
+        });
+
+        const resetLink = document.querySelector('.calendar-reset');
+        if (resetLink) {
+            resetLink.setAttribute('href', this.buildCalendarUrl(year, month, {}));
+        }
+    }
+
+    /**
+     * Mettre à jour le résumé mensuel
+     */
+    renderStatistics(statistics) {
+        document.querySelectorAll('[data-stat]').forEach(element => {
+            element.textContent = statistics[element.getAttribute('data-stat')] || 0;
+        });
+    }
+
+    /**
+     * Formater une date locale en AAAA-MM-JJ
+     */
+    formatDateKey(date) {
+        const month = String(date.getMonth() + 1).padStart(2, '0');
+        const day = String(date.getDate()).padStart(2, '0');
+        return `${date.getFullYear()}-${month}-${day}`;
     }
 
     /**
@@ -403,10 +768,11 @@ class MonitorPlanningCalendar {
         
         localStorage.removeItem('monitor_planning_filters');
         
-        // Rediriger sans les paramètres de filtre
-        const url = new URL(window.location);
-        url.search = `year=${url.searchParams.get('year') || new Date().getFullYear()}&month=${url.searchParams.get('month') || new Date().getMonth() + 1}`;
-        window.location.href = url.toString();
+        // Réafficher le mois courant sans les filtres
+        if (document.querySelector('.calendar-table')) {
+            const { year, month } = this.getDisplayedMonth();
+            this.showMonth(year, month);
+        }
     }
 
     /**
@@ -1,3 +1,6 @@
 # -*- encoding: utf-8 -*-
 
-from . import monitor_substitute_wizard
\ No newline at end of file
+from . import monitor_substitute_wizard
+from . import monitor_report_generate_wizard
+from . import monitor_absence_wizard
+from . import monitor_availability_import_wizard
\ No newline at end of file
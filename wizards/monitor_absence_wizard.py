@@ -0,0 +1,184 @@
+from odoo import models, fields, api, Command
+from collections import defaultdict
+from datetime import timedelta
+from odoo.exceptions import ValidationError, UserError
+from markupsafe import Markup
+
+
+class MonitorAbsenceWizard(models.TransientModel):
+    """Assistant de remplacement d'un moniteur absent sur une période"""
+    _name = "monitor.absence.wizard"
+    _description = "Assistant de remplacement pour absence"
+
+    monitor_id = fields.Many2one(
+        'res.partner',
+        string="Moniteur absent",
+        domain="[('is_monitor', '=', True)]",
+        required=True
+    )
+
+    date_from = fields.Date(string="Absent du", required=True, default=fields.Date.context_today)
+    date_to = fields.Date(string="Au", required=True)
+
+    reason = fields.Text(string="Raison de l'absence", required=True)
+
+    notify_substitute = fields.Boolean(
+        string="Notifier les remplaçants",
+        default=True
+    )
+
+    line_ids = fields.One2many(
+        'monitor.absence.wizard.line',
+        'wizard_id',
+        string="Remplacements proposés",
+        compute="_compute_line_ids",
+        store=True,
+        readonly=False
+    )
+
+    @api.constrains('date_from', 'date_to')
+    def _check_dates(self):
+        for wizard in self:
+            if wizard.date_from > wizard.date_to:
+                raise ValidationError("La date de début doit être antérieure à la date de fin.")
+
+    @api.depends('monitor_id', 'date_from', 'date_to')
+    def _compute_line_ids(self):
+        for wizard in self:
+            commands = [Command.clear()]
+            if wizard.monitor_id and wizard.date_from and wizard.date_to and wizard.date_from <= wizard.date_to:
+                commands += [
+                    Command.create({'planning_id': planning.id, 'substitute_monitor_id': substitute_id})
+                    for planning, substitute_id in wizard._propose_substitutes()
+                ]
+            wizard.line_ids = commands
+
+    def _get_affected_plannings(self):
+        """Planifications du moniteur absent sur la période, sans remplaçant déjà désigné"""
+        return self.env['monitor.planning'].search([
+            ('monitor_id', '=', self.monitor_id.id),
+            ('planned_date', '>=', self.date_from),
+            ('planned_date', '<=', self.date_to),
+            ('state', 'in', ['planned', 'confirmed']),
+            ('substitute_monitor_id', '=', False),
+        ], order='planned_date, start_time')
+
+    def _propose_substitutes(self):
+        """Répartit les remplacements entre les candidats
+
+        Chaque planification reçoit le candidat le moins chargé (en comptant les
+        remplacements déjà proposés par l'assistant) qui n'a pas déjà été retenu
+        sur un créneau qui se chevauche.
+        """
+        plannings = self._get_affected_plannings()
+        suggestions = plannings._get_substitute_suggestions(limit=None)
+        assigned_count = defaultdict(int)
+        assigned_slots = defaultdict(list)
+
+        proposals = []
+        for planning in plannings:
+            best = None
+            for candidate in suggestions.get(planning.id, []):
+                monitor_id = candidate['monitor_id']
+                if any(
+                    planned_date == planning.planned_date and
+                    start_time < planning.end_time and planning.start_time < end_time
+                    for planned_date, start_time, end_time in assigned_slots[monitor_id]
+                ):
+                    continue
+                score = (candidate['recent_load'] + assigned_count[monitor_id], -candidate['average_rating'])
+                if best is None or score < best[0]:
+                    best = (score, monitor_id)
+            substitute_id = best and best[1]
+            if substitute_id:
+                assigned_count[substitute_id] += 1
+                assigned_slots[substitute_id].append((planning.planned_date, planning.start_time, planning.end_time))
+            proposals.append((planning, substitute_id or False))
+        return proposals
+
+    def action_apply(self):
+        """Applique tous les remplacements en écritures groupées"""
+        self.ensure_one()
+        lines = self.line_ids.filtered('substitute_monitor_id')
+        if not lines:
+            raise UserError("Aucun remplaçant n'est proposé pour cette période.")
+
+        # Une écriture par remplaçant
+        plannings_by_substitute = defaultdict(lambda: self.env['monitor.planning'])
+        for line in lines:
+            plannings_by_substitute[line.substitute_monitor_id] |= line.planning_id
+        for substitute, plannings in plannings_by_substitute.items():
+            plannings.write({'substitute_monitor_id': substitute.id})
+
+        # Notes dans le chatter, créées en un lot
+        lines.planning_id._message_log_batch(bodies={
+            line.planning_id.id: Markup(
+                "Remplaçant assigné : %s<br/>Moniteur original : %s<br/>Raison : %s"
+            ) % (line.substitute_monitor_id.name, self.monitor_id.name, self.reason)
+            for line in lines
+        })
+
+        # Une activité récapitulative par remplaçant
+        if self.notify_substitute:
+            activity_type_id = self.env.ref('mail.mail_activity_data_todo').id
+            res_model_id = self.env['ir.model']._get('res.partner').id
+            self.env['mail.activity'].create([
+                self._prepare_substitute_activity_values(substitute, plannings, activity_type_id, res_model_id)
+                for substitute, plannings in plannings_by_substitute.items()
+            ])
+
+        return {
+            'name': "Remplacements assignés",
+            'type': 'ir.actions.act_window',
+            'res_model': 'monitor.planning',
+            'view_mode': 'tree,form',
+            'domain': [('id', 'in', lines.planning_id.ids)],
+        }
+
+    def _prepare_substitute_activity_values(self, substitute, plannings, activity_type_id, res_model_id):
+        """Valeurs de l'activité informant un remplaçant de ses interventions"""
+        plannings = plannings.sorted(lambda planning: (planning.planned_date, planning.start_time))
+        lines = '\n'.join(
+            f"                    - {planning.planned_date.strftime('%d/%m/%Y')} "
+            f"{planning._format_time(planning.start_time)} - {planning._format_time(planning.end_time)} : "
+            f"{planning.school_id.name} ({planning.topic or 'À définir'})"
+            for planning in plannings
+        )
+        return {
+            'activity_type_id': activity_type_id,
+            'summary': f'Remplacements - absence de {self.monitor_id.name}',
+            'note': f'''
+                    Bonjour {substitute.name},
+
+                    Vous avez été désigné(e) pour remplacer {self.monitor_id.name} :
+
+{lines}
+
+                    Raison du remplacement : {self.reason}
+
+                    Merci de confirmer votre disponibilité.
+                ''',
+            'user_id': self.env.user.id,
+            'res_id': substitute.id,
+            'res_model_id': res_model_id,
+            'date_deadline': plannings[0].planned_date - timedelta(days=1),
+        }
+
+
+class MonitorAbsenceWizardLine(models.TransientModel):
+    """Remplacement proposé pour une planification"""
+    _name = "monitor.absence.wizard.line"
+    _description = "Remplacement proposé"
+    _order = "planned_date, start_time"
+
+    wizard_id = fields.Many2one('monitor.absence.wizard', required=True, ondelete='cascade')
+    planning_id = fields.Many2one('monitor.planning', string="Planification", required=True)
+    planned_date = fields.Date(related='planning_id.planned_date', store=True)
+    start_time = fields.Float(related='planning_id.start_time', store=True)
+    end_time = fields.Float(related='planning_id.end_time')
+    school_id = fields.Many2one(related='planning_id.school_id')
+    substitute_monitor_id = fields.Many2one(
+        'res.partner',
+        string="Remplaçant",
+        domain="[('is_monitor', '=', True)]"
+    )
@@ -0,0 +1,306 @@
+from odoo import models, fields, api
+from odoo.exceptions import UserError
+from odoo.tools import split_every
+from datetime import datetime, timedelta, time
+import base64
+import csv
+import io
+import pytz
+
+# Disponibilités créées par lot
+IMPORT_BATCH_SIZE = 1000
+# Nombre maximal d'erreurs détaillées conservées dans le compte rendu
+IMPORT_MAX_ERRORS = 200
+
+AVAILABILITY_TYPES = {'available', 'unavailable', 'limited'}
+AVAILABLE_DAYS = {'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday'}
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y')
+# Encodages essayés pour chaque ligne : UTF-8 puis Windows (exports Excel)
+IMPORT_ENCODINGS = ('utf-8-sig', 'cp1252')
+
+
+class SkippedRow(Exception):
+    """Ligne valide mais volontairement non importée (motif en message)"""
+
+
+class MonitorAvailabilityImportWizard(models.TransientModel):
+    """Assistant d'import des disponibilités depuis un fichier CSV ou ICS"""
+    _name = "monitor.availability.import.wizard"
+    _description = "Assistant d'import des disponibilités"
+
+    file = fields.Binary(string="Fichier", required=True)
+    filename = fields.Char(string="Nom du fichier")
+    file_type = fields.Selection([
+        ('csv', 'CSV'),
+        ('ics', 'Calendrier (ICS)')
+    ], string="Format", compute="_compute_file_type", store=True, readonly=False, required=True)
+
+    monitor_id = fields.Many2one(
+        'res.partner',
+        string="Moniteur",
+        domain="[('is_monitor', '=', True)]",
+        help="Moniteur concerné par un export de calendrier, ou par les lignes CSV sans colonne moniteur"
+    )
+
+    state = fields.Selection([('draft', 'Brouillon'), ('done', 'Terminé')], default='draft')
+    imported_count = fields.Integer(string="Disponibilités importées", readonly=True)
+    error_count = fields.Integer(string="Lignes rejetées", readonly=True)
+    skipped_count = fields.Integer(string="Évènements ignorés", readonly=True)
+    error_log = fields.Text(string="Erreurs", readonly=True)
+
+    @api.depends('filename')
+    def _compute_file_type(self):
+        for wizard in self:
+            if wizard.filename and wizard.filename.lower().endswith(('.ics', '.ical')):
+                wizard.file_type = 'ics'
+            else:
+                wizard.file_type = wizard.file_type or 'csv'
+
+    def action_import(self):
+        """Importe le fichier par lots sans le charger entièrement en mémoire"""
+        self.ensure_one()
+        if self.file_type == 'ics' and not self.monitor_id:
+            raise UserError("Sélectionnez le moniteur auquel appartient ce calendrier.")
+
+        lines = self._decode_lines(base64.b64decode(self.file))
+        rows = self._read_csv(lines) if self.file_type == 'csv' else self._read_ics(lines)
+        monitors = self._get_monitor_lookup()
+
+        imported, errors, skipped = 0, [], []
+        Availability = self.env['monitor.availability']
+        for batch in split_every(IMPORT_BATCH_SIZE, rows):
+            vals_list, batch_errors, batch_skipped = self._validate_rows(batch, monitors)
+            errors.extend(batch_errors)
+            skipped.extend(batch_skipped)
+            if vals_list:
+                Availability.create(vals_list)
+                imported += len(vals_list)
+
+        self.write({
+            'state': 'done',
+            'imported_count': imported,
+            'error_count': len(errors),
+            'skipped_count': len(skipped),
+            'error_log': '\n'.join((errors + skipped)[:IMPORT_MAX_ERRORS]),
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def _get_monitor_lookup(self):
+        """Correspondance email / nom (en minuscules) vers l'id du moniteur, en une requête"""
+        lookup = {}
+        for monitor in self.env['res.partner'].search_read([('is_monitor', '=', True)], ['name', 'email']):
+            for key in (monitor['email'], monitor['name']):
+                if key:
+                    lookup.setdefault(key.strip().lower(), monitor['id'])
+        return lookup
+
+    def _decode_lines(self, data):
+        """Lignes du fichier décodées une à une, pour signaler la ligne fautive"""
+        for line_number, raw_line in enumerate(io.BytesIO(data), start=1):
+            for encoding in IMPORT_ENCODINGS:
+                try:
+                    yield raw_line.decode(encoding)
+                    break
+                except UnicodeDecodeError:
+                    continue
+            else:
+                raise UserError(
+                    f"Ligne {line_number} : caractères illisibles. "
+                    "Enregistrez le fichier en UTF-8 puis relancez l'import."
+                )
+
+    def _read_csv(self, lines):
+        """Lignes du CSV (séparateur détecté sur l'en-tête) : (numéro, dict)"""
+        header = next(lines, '')
+        if not header.strip():
+            raise UserError("Ligne 1 : l'en-tête du fichier CSV est vide.")
+        try:
+            dialect = csv.Sniffer().sniff(header, delimiters=',;\t')
+        except csv.Error:
+            # En-tête d'une seule colonne : séparateur par défaut
+            dialect = csv.excel
+        fieldnames = [name.strip().lower() for name in next(csv.reader([header], dialect))]
+        reader = csv.DictReader(lines, fieldnames=fieldnames, dialect=dialect, strict=True)
+        line_number = 1
+        try:
+            for row in reader:
+                # line_num ne compte pas l'en-tête, déjà lu
+                line_number = reader.line_num + 1
+                yield line_number, row
+        except csv.Error as error:
+            # L'enregistrement fautif commence après la dernière ligne lue
+            raise UserError(f"Ligne {line_number + 1} : fichier CSV invalide ({error}).")
+
+    def _read_ics(self, lines):
+        """Évènements VEVENT du calendrier (indisponibilités) : (numéro, dict)"""
+        event, line_number, event_line = None, 0, None
+        # Les lignes ICS repliées commencent par une espace ou une tabulation
+        for raw_line in self._unfold_ics(lines):
+            line_number += 1
+            head, _sep, value = raw_line.partition(':')
+            name, *params = head.split(';')
+            name = name.upper()
+            if name == 'BEGIN' and value.upper() == 'VEVENT':
+                event, event_line = {'availability_type': 'unavailable'}, line_number
+            elif name == 'END' and value.upper() == 'VEVENT' and event is not None:
+                yield event_line, event
+                event = None
+            elif event is None:
+                continue
+            elif name in ('DTSTART', 'DTEND'):
+                event[name.lower()] = value.strip()
+                for param in params:
+                    key, _sep, param_value = param.partition('=')
+                    if key.upper() == 'TZID':
+                        event[f'{name.lower()}_tzid'] = param_value.strip('"')
+            elif name == 'SUMMARY':
+                event['summary'] = value.strip()
+            elif name in ('RRULE', 'RDATE'):
+                event['skip'] = "évènement récurrent (RRULE) non pris en charge, à saisir manuellement"
+            elif name == 'TRANSP' and value.strip().upper() == 'TRANSPARENT':
+                event['skip'] = "évènement marqué « disponible » dans le calendrier"
+
+    def _unfold_ics(self, lines):
+        current = None
+        for line in lines:
+            line = line.rstrip('\r\n')
+            if line[:1] in (' ', '\t') and current is not None:
+                current += line[1:]
+                continue
+            if current is not None:
+                yield current
+            current = line
+        if current is not None:
+            yield current
+
+    def _validate_rows(self, batch, monitors):
+        """Convertit un lot de lignes en valeurs de création ; retourne (vals_list, erreurs, ignorées)"""
+        vals_list, errors, skipped = [], [], []
+        for line_number, row in batch:
+            try:
+                if row.get('skip'):
+                    raise SkippedRow(row['skip'])
+                vals_list.append(self._row_to_values(row, monitors))
+            except ValueError as error:
+                errors.append(f"Ligne {line_number} : {error}")
+            except SkippedRow as reason:
+                skipped.append(f"Ligne {line_number} (ignorée) : {reason}")
+        return vals_list, errors, skipped
+
+    def _row_to_values(self, row, monitors):
+        if 'dtstart' in row:
+            date_from, date_to = self._parse_ics_period(row)
+        else:
+            date_from = self._parse_date(row.get('date_from'))
+            date_to = self._parse_date(row.get('date_to') or row.get('date_from'))
+        if date_from > date_to:
+            raise ValueError("la date de début est postérieure à la date de fin")
+
+        monitor_key = (row.get('monitor') or row.get('email') or '').strip().lower()
+        monitor_id = monitors.get(monitor_key) if monitor_key else self.monitor_id.id
+        if not monitor_id:
+            raise ValueError(f"moniteur inconnu « {monitor_key} »")
+
+        availability_type = (row.get('availability_type') or 'available').strip().lower()
+        if availability_type not in AVAILABILITY_TYPES:
+            raise ValueError(f"type de disponibilité invalide « {availability_type} »")
+        available_days = (row.get('available_days') or '').strip().lower() or False
+        if available_days and available_days not in AVAILABLE_DAYS:
+            raise ValueError(f"jour invalide « {available_days} »")
+
+        time_from = self._parse_time(row.get('available_time_from'))
+        time_to = self._parse_time(row.get('available_time_to'))
+        if availability_type == 'limited' and time_from and time_to and time_from >= time_to:
+            raise ValueError("l'heure de début doit être antérieure à l'heure de fin")
+
+        return {
+            'monitor_id': monitor_id,
+            'date_from': date_from,
+            'date_to': date_to,
+            'availability_type': availability_type,
+            'available_days': available_days,
+            'available_time_from': time_from,
+            'available_time_to': time_to,
+            'reason': row.get('reason') or row.get('summary') or False,
+        }
+
+    def _parse_date(self, value):
+        value = (value or '').strip()
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format).date()
+            except ValueError:
+                continue
+        raise ValueError(f"date invalide « {value} »")
+
+    def _parse_time(self, value):
+        """Heure au format décimal (14.5) ou HH:MM (14:30)"""
+        value = (value or '').strip().replace(',', '.')
+        if not value:
+            return 0.0
+        try:
+            if ':' in value:
+                hours, _sep, minutes = value.partition(':')
+                time_float = int(hours) + int(minutes) / 60.0
+            else:
+                time_float = float(value)
+        except ValueError:
+            raise ValueError(f"heure invalide « {value} »")
+        if not 0 <= time_float <= 24:
+            raise ValueError(f"heure invalide « {value} »")
+        return time_float
+
+    def _parse_ics_period(self, row):
+        """Jours couverts par un évènement, en dates locales (DTEND est exclusif)
+
+        Les évènements horaires ne sont importés que s'ils couvrent des journées
+        entières : une indisponibilité de quelques heures ne peut pas être
+        représentée par une disponibilité et est signalée comme ignorée.
+        """
+        local_tz = pytz.timezone(self.env.context.get('tz') or self.env.user.tz or 'UTC')
+        start = self._parse_ics_datetime(row['dtstart'], row.get('dtstart_tzid'), local_tz)
+        end = self._parse_ics_datetime(row['dtend'], row.get('dtend_tzid'), local_tz) if row.get('dtend') else None
+        if end is not None and isinstance(start, datetime) != isinstance(end, datetime):
+            raise ValueError("DTSTART et DTEND doivent être tous deux des dates, ou tous deux des dates avec heure")
+
+        if not isinstance(start, datetime):
+            # Journée entière : un seul jour si DTEND est absent
+            date_to = end - timedelta(days=1) if end and end > start else start
+            return start, date_to
+
+        end = end or start
+        if start.time() == time.min and end.time() == time.min and end > start:
+            return start.date(), end.date() - timedelta(days=1)
+        raise SkippedRow(
+            f"évènement horaire du {start:%d/%m/%Y %H:%M} au {end:%d/%m/%Y %H:%M}, "
+            "seules les indisponibilités à la journée sont importées"
+        )
+
+    def _parse_ics_datetime(self, value, tzid, local_tz):
+        """Date (journée entière) ou date et heure locale naïve d'une valeur ICS
+
+        Les heures UTC (suffixe Z) ou associées à un TZID sont converties dans le
+        fuseau de l'utilisateur ; les heures flottantes y sont déjà exprimées.
+        """
+        try:
+            if 'T' not in value:
+                return datetime.strptime(value[:8], '%Y%m%d').date()
+            moment = datetime.strptime(value.rstrip('Zz')[:15], '%Y%m%dT%H%M%S')
+        except ValueError:
+            raise ValueError(f"date invalide « {value} »")
+        if value[-1:] in ('Z', 'z'):
+            moment = pytz.utc.localize(moment)
+        elif tzid:
+            try:
+                moment = pytz.timezone(tzid).localize(moment)
+            except pytz.UnknownTimeZoneError:
+                raise ValueError(f"fuseau horaire inconnu « {tzid} »")
+        else:
+            return moment
+        return moment.astimezone(local_tz).replace(tzinfo=None)
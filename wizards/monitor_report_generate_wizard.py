@@ -0,0 +1,51 @@
+from odoo import models, fields, api
+from datetime import timedelta
+from odoo.exceptions import ValidationError
+
+
+class MonitorReportGenerateWizard(models.TransientModel):
+    """Assistant de génération groupée des rapports d'activité"""
+    _name = "monitor.report.generate.wizard"
+    _description = "Assistant de génération des rapports d'activité"
+
+    def _default_period_to(self):
+        return fields.Date.today().replace(day=1) - timedelta(days=1)
+
+    def _default_period_from(self):
+        return self._default_period_to().replace(day=1)
+
+    period_from = fields.Date(string="Période du", required=True, default=_default_period_from)
+    period_to = fields.Date(string="Au", required=True, default=_default_period_to)
+
+    monitor_ids = fields.Many2many(
+        'res.partner',
+        string="Moniteurs",
+        domain="[('is_monitor', '=', True)]",
+        help="Laisser vide pour générer les rapports de tous les moniteurs actifs"
+    )
+
+    @api.constrains('period_from', 'period_to')
+    def _check_period_dates(self):
+        for wizard in self:
+            if wizard.period_from > wizard.period_to:
+                raise ValidationError("La date de début de période doit être antérieure à la date de fin.")
+
+    def action_generate_reports(self):
+        """Génère les rapports brouillons de la période"""
+        self.ensure_one()
+        self.env['monitor.report']._generate_period_reports(
+            self.period_from,
+            self.period_to,
+            monitors=self.monitor_ids or None,
+        )
+        return {
+            'name': "Rapports générés",
+            'type': 'ir.actions.act_window',
+            'res_model': 'monitor.report',
+            'view_mode': 'tree,form',
+            'domain': [
+                ('period_from', '=', self.period_from),
+                ('period_to', '=', self.period_to),
+            ],
+            'context': {'create': False},
+        }
@@ -1,4 +1,4 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, Command
 from datetime import datetime, timedelta, date
 from dateutil.relativedelta import relativedelta
 from odoo.exceptions import ValidationError, UserError
@@ -22,10 +22,21 @@ class MonitorSubstituteWizard(models.TransientModel):
         readonly=True
     )
     
+    suggestion_ids = fields.One2many(
+        'monitor.substitute.suggestion',
+        'wizard_id',
+        string="Remplaçants suggérés",
+        compute="_compute_suggestion_ids",
+        store=True
+    )
+    
     substitute_monitor_id = fields.Many2one(
         'res.partner',
         string="Moniteur remplaçant",
         domain="[('is_monitor', '=', True)]",
+        compute="_compute_substitute_monitor_id",
+        store=True,
+        readonly=False,
         required=True
     )
     
@@ -36,6 +47,22 @@ class MonitorSubstituteWizard(models.TransientModel):
         default=True
     )
     
+    @api.depends('planning_id')
+    def _compute_suggestion_ids(self):
+        suggestions = self.planning_id._get_substitute_suggestions()
+        for wizard in self:
+            wizard.suggestion_ids = [Command.clear()] + [
+                Command.create(dict(values, sequence=rank))
+                for rank, values in enumerate(suggestions.get(wizard.planning_id.id, []), start=1)
+            ]
+    
+    @api.depends('suggestion_ids')
+    def _compute_substitute_monitor_id(self):
+        # Meilleur candidat proposé par défaut
+        for wizard in self:
+            if not wizard.substitute_monitor_id and wizard.suggestion_ids:
+                wizard.substitute_monitor_id = wizard.suggestion_ids[0].monitor_id
+    
     def action_assign_substitute(self):
         """Assigne le remplaçant"""
         self.ensure_one()
@@ -76,4 +103,17 @@ class MonitorSubstituteWizard(models.TransientModel):
                 'date_deadline': self.planning_id.planned_date - timedelta(days=1),
             })
         
-        return {'type': 'ir.actions.act_window_close'}
\ No newline at end of file
+        return {'type': 'ir.actions.act_window_close'}
+
+
+class MonitorSubstituteSuggestion(models.TransientModel):
+    """Remplaçant suggéré, classé par disponibilité, charge et évaluations"""
+    _name = "monitor.substitute.suggestion"
+    _description = "Remplaçant suggéré"
+    _order = "sequence"
+
+    wizard_id = fields.Many2one('monitor.substitute.wizard', required=True, ondelete='cascade')
+    sequence = fields.Integer(string="Rang")
+    monitor_id = fields.Many2one('res.partner', string="Moniteur", required=True)
+    recent_load = fields.Integer(string="Charge récente")
+    average_rating = fields.Float(string="Note moyenne")